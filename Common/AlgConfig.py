@@ -1,3 +1,6 @@
+from Common.SimCache import SimCache
+from Common.Archive import Archive
+
 class AlgConfig:
     '''Algorithm settings.
     '''
@@ -6,9 +9,58 @@ class AlgConfig:
         #Max number of attempts to generate random solution
         self.maxGenIter = 10
         self.metamodel = None
+        #Run simulation through xml-files and separate process (for debugging)
+        self.sim_xml = False
+        #Cache of simulation results
+        self.simcache = SimCache()
+        #Cache of system fitness (reliability, cost, times and penalty), cleared before every run
+        self.fitcache = SimCache()
+        #Persistent archive of simulation results, it's kept between runs and executions (None - not used)
+        self.archive = None
+        #Method of module times evaluation: "sim", "cpath" or "screen"
+        self.time_method = "sim"
+        #If critical path estimate should account for the shared channel (upper bound)
+        self.cpath_upper = False
+        #Relative distance to deadline which needs simulation in "screen" mode
+        self.screen_margin = 0.1
+        #Number of processes for independent runs (0 - number of CPUs)
+        self.processes = 1
+        #Metamodel estimate of system is checked by simulation if time of some module is within
+        #uncertainty_band standard deviations of estimate from deadline. Then GA checks only candidates
+        #by simulation instead of whole generations (see pop_control_percent). 0 - don't check estimates
+        self.uncertainty_band = 0.0
+        #Wall-clock limit of exact algorithms in seconds (None - no limit)
+        self.time_budget = None
+        #Exhaustive search: number of combinations evaluated at once
+        #and number of the best solutions kept for every ordering
+        self.chunk_size = 100000
+        self.top_num = 10
 
     def LoadFromXmlNode(self, node):
         '''Loading from xml-node with tag 'alg'.
         Should be reimplemented in subclass
         :param node: <alg> node in xml-file'''
-        pass
+        if node.hasAttribute("simxml"):
+            self.sim_xml = node.getAttribute("simxml") == "True"
+        if node.hasAttribute("simcache"):
+            self.simcache = SimCache(int(node.getAttribute("simcache")))
+        if node.hasAttribute("fitcache"):
+            self.fitcache = SimCache(int(node.getAttribute("fitcache")))
+        if node.hasAttribute("archive"):
+            self.archive = Archive(node.getAttribute("archive"))
+        if node.hasAttribute("timeeval"):
+            self.time_method = node.getAttribute("timeeval")
+        if node.hasAttribute("cpathupper"):
+            self.cpath_upper = node.getAttribute("cpathupper") == "True"
+        if node.hasAttribute("screenmargin"):
+            self.screen_margin = float(node.getAttribute("screenmargin"))
+        if node.hasAttribute("processes"):
+            self.processes = int(node.getAttribute("processes"))
+        if node.hasAttribute("band"):
+            self.uncertainty_band = float(node.getAttribute("band"))
+        if node.hasAttribute("timebudget"):
+            self.time_budget = float(node.getAttribute("timebudget"))
+        if node.hasAttribute("chunksize"):
+            self.chunk_size = int(node.getAttribute("chunksize"))
+        if node.hasAttribute("topnum"):
+            self.top_num = int(node.getAttribute("topnum"))
@@ -5,8 +5,12 @@ class Algorithm:
     algconf = None
     timecounts = 0
     simcounts = 0
+    simhits = 0
+    fithits = 0
     time = None
     result_filename = "result.csv"
+    #algorithm starts its own processes, so its executions can't be run in process pool
+    multiprocess = False
 
     def __init__(self):
         self.currentSolution = None
@@ -31,6 +35,8 @@ class Algorithm:
         self.currentIter = 0
         self.timecounts = 0
         self.simcounts = 0
+        self.simhits = 0
+        self.fithits = 0
         self.time = None
 
     def PrintStats(self):
@@ -0,0 +1,117 @@
+import sqlite3, ast, os
+
+class Archive:
+    '''Persistent archive of simulation results: chromosome (see System.chromosome) --> module times.
+    Results are kept in SQLite file and keyed by system configuration (see SysConfig.fingerprint),
+    so one file can be used for several configurations and results are reused
+    by later runs and executions with the same configuration.
+    Results of configuration are loaded at the first request (get, add or systems),
+    new results are written to file only by Flush, file is opened for reading and writing only there.
+    Archive with readonly = True never writes to file: new results are kept in pending
+    (it's used by worker processes, their results are written by the main process, see Common.Parallel).
+    :param filename: name of SQLite file (it's created if doesn't exist).
+    '''
+    def __init__(self, filename):
+        self.filename = filename
+        self.readonly = False
+        self.Clear()
+
+    def Clear(self):
+        '''Forgets loaded results (file isn't changed), they're loaded again at the next request.'''
+        #configuration of loaded results
+        self.key = None
+        self.items = {}
+        #systems made of results (see systems)
+        self.built = []
+        #new results which aren't written to file yet: list of pairs (chromosome, times)
+        self.pending = []
+        self.hits = 0
+
+    def __load(self):
+        '''Loads results of current configuration (Module.conf) if they aren't loaded yet.'''
+        from Common.Module import Module
+        key = Module.conf.fingerprint()
+        if key == self.key:
+            return
+        self.Flush()
+        self.key = key
+        self.items = {}
+        self.built = []
+        self.pending = []
+        if not os.path.exists(self.filename):
+            return
+        db = sqlite3.connect(self.filename)
+        try:
+            for chromosome, times in db.execute("SELECT chromosome, times FROM sims WHERE config = ?", (key,)):
+                self.items[str(chromosome)] = [int(t) for t in times.split(",")]
+        except sqlite3.OperationalError:
+            # table isn't created yet
+            pass
+        finally:
+            db.close()
+
+    def get(self, system):
+        '''
+        :param system: object of class 'System'.
+        :returns: list of module times or None if system wasn't simulated.
+        '''
+        self.__load()
+        times = self.items.get(repr(system.chromosome()))
+        if times != None:
+            self.hits += 1
+        return times
+
+    def add(self, system):
+        '''Adds simulated system.
+        :param system: object of class 'System' with simulated times.
+        '''
+        self.__load()
+        self.extend([(repr(system.chromosome()), [m.time for m in system.modules])])
+
+    def extend(self, results):
+        '''Adds results of other archive (see pending) for current configuration.
+        :param results: list of pairs (chromosome, times).
+        '''
+        self.__load()
+        for chromosome, times in results:
+            if chromosome not in self.items:
+                self.items[chromosome] = times
+                self.pending.append((chromosome, times))
+
+    def systems(self):
+        '''
+        Makes systems of archived results (e.g. for training of metamodel).
+        Only modules and their times are set. Systems are made once, later calls make only new ones.
+        :returns: list of objects of class 'System'.
+        '''
+        from Common.System import System
+        from Common.Module import tools
+        self.__load()
+        if len(self.built) < len(self.items):
+            classes = dict((cls.__name__, cls) for cls in tools.values())
+            done = set(repr(s.chromosome()) for s in self.built)
+            for chromosome, times in self.items.items():
+                if chromosome in done:
+                    continue
+                s = System()
+                for num, (name, hw, sw) in enumerate(ast.literal_eval(chromosome)):
+                    m = classes[name](num, list(hw), list(sw))
+                    m.time = times[num]
+                    s.modules.append(m)
+                self.built.append(s)
+        return self.built
+
+    def Flush(self):
+        '''Writes new results to file (nothing is written if archive is readonly).'''
+        if self.readonly or self.pending == []:
+            return
+        db = sqlite3.connect(self.filename)
+        try:
+            db.execute("CREATE TABLE IF NOT EXISTS sims (config TEXT, chromosome TEXT, times TEXT, "
+                       "PRIMARY KEY (config, chromosome))")
+            db.executemany("INSERT OR IGNORE INTO sims VALUES (?, ?, ?)",
+                           [(self.key, c, ",".join(str(t) for t in times)) for c, times in self.pending])
+            db.commit()
+        finally:
+            db.close()
+        self.pending = []
@@ -0,0 +1,234 @@
+'''Headless batch experiments: cartesian product of systems, algorithms, GA parameters, metamodels and seeds
+is run in process pool, results of all runs are written to one table.
+Sweep is loaded from xml-file with tag 'sweep', lists are comma-separated, e.g.
+<sweep alg="alg.xml" systems="example.xml" algorithms="HGA,GA_Moore" popsize="30,50" maxiter="30"
+       metamodels="none,kn" seeds="1,2,3" percent="30" processes="0" result="sweep.csv"/>
+'''
+import multiprocessing, os, sys, random, time, itertools, xml.dom.minidom
+from Common.SysConfig import SysConfig
+from Common.Constraints import CostConstraints, TimeConstraints
+from Common.System import System
+from Common.Module import Module
+from Common.Algorithm import Algorithm
+from Common.Parallel import resetMetamodel
+from GA.GAConfig import GAConfig
+from GA.GA import GA
+from GA.HGA import HGA
+from GA.GA_optimistic import GA_optimistic
+from GA.GA_optimistic_left import GA_optimistic_left
+from GA.GA_Moore import GA_Moore
+from GA.HGA_Moore import HGA_Moore
+from Exact.BranchAndBound import BranchAndBound
+from Exact.Exhaustive import Exhaustive
+from Exact.Knapsack import Knapsack
+from Metamodels.KNearestNeighbours import KNearestNeighbours
+from Metamodels.Polynomial import Polynomial
+
+#algorithm name --> class (island models start their own processes, so they can't be run in the pool)
+algorithms = {"GA": GA, "HGA": HGA, "GA_optimistic": GA_optimistic, "GA_optimistic_left": GA_optimistic_left,
+              "GA_Moore": GA_Moore, "HGA_Moore": HGA_Moore, "BranchAndBound": BranchAndBound,
+              "Exhaustive": Exhaustive, "Knapsack": Knapsack}
+
+def makeMetamodel(name):
+    '''
+    :param name: "none", "kn" (k nearest neighbours) or "lr" (polynomial regression).
+    :returns: object of subclass of 'Metamodel' for current configuration (Module.conf) or None.
+    '''
+    if name == "none":
+        return None
+    elif name == "kn":
+        return KNearestNeighbours(10)
+    elif name == "lr":
+        return Polynomial(Module.conf)
+    raise ValueError("Unknown metamodel: " + name)
+
+def loadSystem(filename):
+    '''Loads system configuration and constraints to Module.conf and System.constraints.'''
+    Module.conf = SysConfig()
+    Module.conf.loadXML(filename)
+    System.constraints = []
+    if Module.conf.limitcost != None:
+        System.constraints.append(CostConstraints(Module.conf.limitcost))
+    c = Module.conf.getLimitTimes()
+    if c != None:
+        System.constraints.append(TimeConstraints(c))
+
+def loadAlgConfig(filename):
+    '''Loads algorithm configuration to Algorithm.algconf.'''
+    f = open(filename, "r")
+    dom = xml.dom.minidom.parse(f)
+    Algorithm.algconf = GAConfig()
+    Algorithm.algconf.LoadFromXmlNode(dom.childNodes[0])
+    f.close()
+
+class Sweep:
+    '''Sweep of experiments.
+    '''
+    def __init__(self):
+        self.algfile = "alg.xml"
+        self.systems = []
+        self.algorithms = ["HGA"]
+        #None - value of alg.xml
+        self.popsizes = [None]
+        self.maxiters = [None]
+        self.metamodels = ["none"]
+        self.seeds = [0]
+        #Percent of generations checked by simulation if metamodel is used (see pop_control_percent)
+        self.percent = None
+        #Number of processes (0 - number of CPUs)
+        self.processes = 0
+        self.result = "sweep.csv"
+
+    def LoadFromXmlNode(self, node):
+        '''Loading from xml-node with tag 'sweep'.
+        :param node: <sweep> node in xml-file'''
+        def values(name, type=str):
+            return [type(v.strip()) for v in node.getAttribute(name).split(",") if v.strip() != ""]
+        if node.hasAttribute("alg"):
+            self.algfile = node.getAttribute("alg")
+        self.systems = values("systems")
+        if node.hasAttribute("algorithms"):
+            self.algorithms = values("algorithms")
+        if node.hasAttribute("popsize"):
+            self.popsizes = values("popsize", int)
+        if node.hasAttribute("maxiter"):
+            self.maxiters = values("maxiter", int)
+        if node.hasAttribute("metamodels"):
+            self.metamodels = values("metamodels")
+        if node.hasAttribute("seeds"):
+            self.seeds = values("seeds", int)
+        if node.hasAttribute("percent"):
+            self.percent = float(node.getAttribute("percent"))
+        if node.hasAttribute("processes"):
+            self.processes = int(node.getAttribute("processes"))
+        if node.hasAttribute("result"):
+            self.result = node.getAttribute("result")
+        for name in self.algorithms:
+            if name not in algorithms:
+                raise ValueError("Unknown algorithm: " + name)
+        for name in self.metamodels:
+            if name not in ["none", "kn", "lr"]:
+                raise ValueError("Unknown metamodel: " + name)
+        if self.percent == None and any(name != "none" for name in self.metamodels):
+            raise ValueError("Percent of generations checked by simulation must be defined for metamodels")
+
+    def loadXML(self, filename):
+        f = open(filename, "r")
+        dom = xml.dom.minidom.parse(f)
+        self.LoadFromXmlNode(dom.childNodes[0])
+        f.close()
+
+    def jobs(self):
+        '''
+        :returns: list of experiments, every experiment is a tuple
+        (system file, algorithm file, algorithm, popsize, maxiter, metamodel, seed, percent).
+        '''
+        return [(s, self.algfile, a, p, i, m, seed, self.percent) for s, a, p, i, m, seed in
+                itertools.product(self.systems, self.algorithms, self.popsizes, self.maxiters, self.metamodels, self.seeds)]
+
+#experiments are made in worker process, archive file is written only by the main process
+_worker = False
+
+def runJob(job):
+    '''Makes one experiment (configurations are loaded again, so it doesn't depend on previous experiments).
+    Algorithm output is suppressed. New results of persistent archive are written to file,
+    in worker process they're returned instead.
+    :param job: tuple, see Sweep.jobs.
+    :returns: pair (row of results table, new results of archive), see Archive.pending.
+    '''
+    sysfile, algfile, name, popsize, maxiter, metamodel, seed, percent = job
+    loadSystem(sysfile)
+    loadAlgConfig(algfile)
+    archive = Algorithm.algconf.archive
+    if archive != None:
+        archive.readonly = _worker
+    # experiments are run in the pool, so runs of algorithm aren't parallel
+    Algorithm.algconf.processes = 1
+    if popsize != None:
+        Algorithm.algconf.popNum = popsize
+    if maxiter != None:
+        Algorithm.algconf.maxIter = maxiter
+    Algorithm.algconf.metamodel = makeMetamodel(metamodel)
+    Algorithm.algconf.use_metamodel = Algorithm.algconf.metamodel != None
+    if percent != None:
+        Algorithm.algconf.pop_control_percent = percent / 100.0
+    resetMetamodel(Algorithm.algconf)
+    random.seed(seed)
+    algorithm = algorithms[name]()
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        algorithm.Run()
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    row = [sysfile, name, Algorithm.algconf.popNum, Algorithm.algconf.maxIter, metamodel, seed]
+    if algorithm.stat.execs == []:
+        row += [""] * 10
+    else:
+        e = algorithm.stat.execs[-1]
+        s = e.solution
+        row += [s.relL, s.relR, s.cost, s.CheckConstraints(), e.iter, e.time, e.timecounts,
+                e.simcounts, e.simhits, e.fithits]
+    results = []
+    if archive != None:
+        if archive.readonly:
+            results = archive.pending
+        else:
+            archive.Flush()
+    return row, results
+
+def _initWorker():
+    global _worker
+    _worker = True
+
+def _writeArchive(job, results):
+    '''Writes new results of archive from worker process (they're kept for configuration of the system).'''
+    loadSystem(job[0])
+    loadAlgConfig(job[1])
+    Algorithm.algconf.archive.extend(results)
+    Algorithm.algconf.archive.Flush()
+
+def runSweep(sweep):
+    '''
+    Runs all experiments of sweep in sweep.processes processes (1 - in this process, 0 - number of CPUs)
+    and writes results table (sweep.result, csv with ';' separator).
+    Rows are in order of experiments (see Sweep.jobs), table is rewritten after every experiment.
+    :param sweep: object of class 'Sweep'.
+    :returns: list of rows.
+    '''
+    jobs = sweep.jobs()
+    rows = []
+    processes = sweep.processes
+    if processes == 0:
+        processes = multiprocessing.cpu_count()
+    pool = None
+    if processes == 1 or len(jobs) <= 1:
+        results = itertools.imap(runJob, jobs)
+    else:
+        pool = multiprocessing.Pool(min(processes, len(jobs)), _initWorker)
+        results = pool.imap(runJob, jobs)
+    start = time.time()
+    try:
+        for job, (row, archived) in itertools.izip(jobs, results):
+            if archived != []:
+                _writeArchive(job, archived)
+            rows.append(row)
+            print "[%d/%d] %s %s popsize=%s maxiter=%s metamodel=%s seed=%d: RelL = %s RelR = %s Sim_num = %s" % (
+                len(rows), len(jobs), row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[13])
+            exportToCsv(rows, sweep.result)
+    finally:
+        if pool != None:
+            pool.close()
+            pool.join()
+    print "Experiments: %d time: %.2f s" % (len(jobs), time.time() - start)
+    return rows
+
+def exportToCsv(rows, filename):
+    '''Writes results table to csv-file.'''
+    f = open(filename, "w")
+    f.write("System;Algorithm;PopSize;MaxIter;Metamodel;Seed;RelL;RelR;Cost;Feasible;IterNum;Time(sec);"
+            "GetTime_num;Sim_num;Sim_hits;Fit_hits;\n")
+    for row in rows:
+        f.write(";".join(str(v) for v in row) + ";\n")
+    f.close()
@@ -1,21 +1,104 @@
 '''There are some necessary common functions here
 '''
-import random
+import random, bisect
+
+class Sampler:
+    '''Roulette wheel for many draws with the same probabilities (Walker's alias method).
+    It is built in O(n), then every draw is O(1).
+    :param events: list of events.
+    :param weights: list of nonnegative weights of events (they are normalized here).
+    '''
+    def __init__(self, events, weights):
+        self.events = list(events)
+        n = len(self.events)
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights]
+        self.prob = [1.0] * n
+        self.alias = range(n)
+        small = [i for i in range(n) if scaled[i] < 1.0]
+        large = [i for i in range(n) if scaled[i] >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+        # the rest have probability 1.0 up to rounding errors
+
+    def get(self):
+        '''
+        :returns: random event.
+        '''
+        return self.sample(1)[0]
+
+    def sample(self, k):
+        '''
+        :param k: number of draws.
+        :returns: list of k random events (with replacement).
+        '''
+        n = len(self.events)
+        res = []
+        for j in range(k):
+            u = random.random() * n
+            i = int(u)
+            if i == n:
+                i = n - 1
+            if u - i < self.prob[i]:
+                res.append(self.events[i])
+            else:
+                res.append(self.events[self.alias[i]])
+        return res
 
 def genEvent(dict):
     '''Generates random event from dictionary.
+    For many draws with the same probabilities use Sampler.
     :param dict: dictionaty event --> probability.
     Event must be hashable.
     :returns: Event.
     '''
-    points = [0]
-    cur = 0
-    for event in dict.keys():
-        cur += dict[event]
-        points.append(cur)
-    i = random.random()
-    for p in range(1,len(points)):
-        if points[p-1] <= i < points[p]:
-            return dict.keys()[p-1]
+    return Sampler(dict.keys(), dict.values()).get()
+
+def paretoFront(items):
+    '''Removes dominated items.
+    Item is dominated if there is other item with not greater cost and not lower reliability bounds
+    (of equal items the first one is kept).
+    :param items: list of tuples (cost, relL, relR, ...).
+    :returns: list of not dominated items sorted by cost.
+    '''
+    items = sorted(items, key=lambda x: (x[0], -x[1], -x[2]))
+    # staircase of kept items: relL ascending, relR descending
+    front = []
+    frontL = []
+    res = []
+    for x in items:
+        i = bisect.bisect_left(frontL, x[1])
+        if i < len(front) and front[i][2] >= x[2]:
+            continue
+        j = bisect.bisect_right(frontL, x[1])
+        k = j
+        while k > 0 and front[k - 1][2] <= x[2]:
+            k -= 1
+        front[k:j] = [x]
+        frontL[k:j] = [x[1]]
+        res.append(x)
+    return res
+
+def paretoFrontTimed(items):
+    '''Removes dominated items like paretoFront, but item is dominated only
+    if other item also has not greater time.
+    :param items: list of tuples (cost, relL, relR, time, ...).
+    :returns: list of not dominated items sorted by cost.
+    '''
+    items = sorted(items, key=lambda x: (x[0], -x[1], -x[2], x[3]))
+    res = []
+    for x in items:
+        for y in res:
+            if y[1] >= x[1] and y[2] >= x[2] and y[3] <= x[3]:
+                break
         else:
-            return dict.keys()[len(points)-2]
\ No newline at end of file
+            res.append(x)
+    return res
@@ -0,0 +1,173 @@
+'''Vectorized computation of module reliability, cost and execution time for many configurations at once.
+Results are the same as ones of _computeRel, _computeCost and _computeExecTime of module classes.
+HWRC20 isn't supported: its reliability depends on other modules of reconfiguration zone.
+Requires numpy.
+'''
+try:
+    import numpy
+except ImportError:
+    numpy = None
+from Common.Module import failNVP01, failNVP11, failRB11, tools
+
+#tool --> numbers of used hw and sw versions
+widths = {"none": (1, 1), "nvp01": (1, 3), "nvp11": (3, 3), "rb11": (2, 2), "hwrc20": (1, 1)}
+
+def available():
+    '''Checks if numpy is installed.'''
+    return numpy != None
+
+def configArrays(conf, tool):
+    '''Returns all configurations of module with tool 'tool' as arrays.
+    :param conf: object of class 'ModConfig'.
+    :returns: tuple (hw, sw) of integer arrays, one row per configuration.
+    '''
+    configs = conf.GetConfigs(tool)
+    hwNum, swNum = widths[tool]
+    hw = numpy.array([c[0] for c in configs], dtype=int).reshape(len(configs), hwNum)
+    sw = numpy.array([c[1] for c in configs], dtype=int).reshape(len(configs), swNum)
+    return hw, sw
+
+def computeCost(conf, tool, hw, sw):
+    '''Computes costs of configurations of one module, arguments are the same as ones of computeRel.
+    :returns: integer array.
+    '''
+    if tool not in ("none", "nvp01", "nvp11", "rb11"):
+        raise ValueError("Cost of tool '%s' can't be vectorized" % tool)
+    hwCost = numpy.array([c.cost for c in conf.hw], dtype=numpy.int64)[numpy.asarray(hw)].sum(axis=1)
+    swCost = numpy.array([c.cost for c in conf.sw], dtype=numpy.int64)[numpy.asarray(sw)].sum(axis=1)
+    if tool == "rb11":
+        #every sw version is run on both hw versions
+        return hwCost + 2 * swCost
+    return hwCost + swCost
+
+def computeExecTime(conf, tool, hw, sw):
+    '''Computes execution times of configurations of one module, arguments are the same as ones of computeRel.
+    :returns: integer array.
+    '''
+    hw = numpy.asarray(hw)
+    sw = numpy.asarray(sw)
+    #times[sw version, hw version]
+    times = numpy.array(conf.times, dtype=numpy.int64)
+    if tool == "none":
+        return times[sw[:, 0], hw[:, 0]]
+    if tool == "nvp01":
+        return times[sw[:, 0], hw[:, 0]] + times[sw[:, 1], hw[:, 0]] + times[sw[:, 2], hw[:, 0]] + conf.tvote
+    if tool == "nvp11":
+        return numpy.maximum(numpy.maximum(times[sw[:, 0], hw[:, 0]], times[sw[:, 1], hw[:, 1]]),
+                             times[sw[:, 2], hw[:, 2]]) + conf.tvote
+    if tool == "rb11":
+        return (numpy.maximum(times[sw[:, 0], hw[:, 0]] + times[sw[:, 1], hw[:, 0]],
+                              times[sw[:, 0], hw[:, 1]] + times[sw[:, 1], hw[:, 1]]) +
+                2 * conf.ttest + conf.trecov)
+    raise ValueError("Execution time of tool '%s' can't be vectorized" % tool)
+
+def computeRel(conf, tool, hw, sw):
+    '''Computes reliability intervals for configurations of one module.
+    :param conf: object of class 'ModConfig'.
+    :param tool: "none", "nvp01", "nvp11" or "rb11".
+    :param hw: integer array, one row of used hw versions per configuration.
+    :param sw: integer array, one row of used sw versions per configuration.
+    :returns: tuple of arrays (relL, relR).
+    '''
+    hw = numpy.asarray(hw)
+    sw = numpy.asarray(sw)
+    hwL = numpy.array([c.relL for c in conf.hw])
+    hwR = numpy.array([c.relR for c in conf.hw])
+    swL = numpy.array([c.relL for c in conf.sw])
+    swR = numpy.array([c.relR for c in conf.sw])
+    if tool == "none":
+        return hwL[hw[:, 0]] * swR[sw[:, 0]], hwR[hw[:, 0]] * swR[sw[:, 0]]
+    QrvL = conf.qrvL
+    QrvR = conf.qrvR
+    PrvL = 1 - QrvR
+    PrvR = 1 - QrvL
+    QdL = conf.qdL
+    QdR = conf.qdR
+    PdL = 1 - QdR
+    PdR = 1 - QdL
+    QallL = conf.qallL
+    QallR = conf.qallR
+    PallL = 1 - QallR
+    PallR = 1 - QallL
+    QhwL = [hwL[hw[:, i]] for i in range(hw.shape[1])]
+    QhwR = [hwR[hw[:, i]] for i in range(hw.shape[1])]
+    PhwL = [1 - q for q in QhwR]
+    PhwR = [1 - q for q in QhwL]
+    QswL = [swL[sw[:, i]] for i in range(sw.shape[1])]
+    QswR = [swR[sw[:, i]] for i in range(sw.shape[1])]
+    PswL = [1 - q for q in QswR]
+    PswR = [1 - q for q in QswL]
+    if tool == "nvp01":
+        PL = failNVP01(QhwL[0], PhwL[0], QswL[0], PswL[0], QswL[1], PswL[1], PswL[2],
+                       QrvL, PrvL, QdL, PdL, QallL, PallL)
+        PR = failNVP01(QhwR[0], PhwR[0], QswR[0], PswR[0], QswR[1], PswR[1], PswR[2],
+                       QrvR, PrvR, QdR, PdR, QallR, PallR)
+    elif tool == "nvp11":
+        PL = failNVP11(QhwL[0], PhwL[0], QhwL[1], PhwL[1], QhwL[2], PhwL[2],
+                       QswL[0], PswL[0], QswL[1], PswL[1], QswL[2], PswL[2],
+                       QrvL, PrvL, QrvL ** 3, QdL, PdL, QallL, PallL)
+        PR = failNVP11(QhwR[0], PhwR[0], QhwR[1], PhwR[1], QhwR[2], PhwR[2],
+                       QswR[0], PswR[0], QswR[1], PswR[1], QswR[2], PswR[2],
+                       QrvR, PrvR, QrvR ** 3, QdR, PdR, QallR, PallR)
+    elif tool == "rb11":
+        PL = failRB11(PhwL[0], PhwL[1], PswL[0], PswL[1], QrvL, PrvL, QdL, PdL, QallL, PallL)
+        PR = failRB11(PhwR[0], PhwR[1], PswR[0], PswR[1], QrvR, PrvR, QdR, PdR, QallR, PallR)
+    else:
+        raise ValueError("Reliability of tool '%s' can't be vectorized" % tool)
+    return 1 - PR, 1 - PL
+
+class ConfigTable:
+    '''All configurations of module (except HWRC20) with their reliability, cost and execution time.
+    Configurations are numbered in order of tools of module and of ModConfig.GetConfigs.
+    Use configTable to get it, it's computed once for module configuration.
+    :param conf: object of class 'ModConfig'.
+    '''
+    def __init__(self, conf):
+        self.num = conf.num
+        #tool, hw and sw versions of every configuration
+        self.tools = []
+        self.hw = []
+        self.sw = []
+        relL = []
+        relR = []
+        cost = []
+        execTime = []
+        for tool in conf.tools:
+            if tool == "hwrc20":
+                continue
+            hw, sw = configArrays(conf, tool)
+            L, R = computeRel(conf, tool, hw, sw)
+            relL.append(L)
+            relR.append(R)
+            cost.append(computeCost(conf, tool, hw, sw))
+            execTime.append(computeExecTime(conf, tool, hw, sw))
+            self.tools += [tool] * len(hw)
+            self.hw += hw.tolist()
+            self.sw += sw.tolist()
+        self.relL = numpy.concatenate(relL) if relL != [] else numpy.zeros(0)
+        self.relR = numpy.concatenate(relR) if relR != [] else numpy.zeros(0)
+        self.cost = numpy.concatenate(cost) if cost != [] else numpy.zeros(0, dtype=numpy.int64)
+        self.execTime = numpy.concatenate(execTime) if execTime != [] else numpy.zeros(0, dtype=numpy.int64)
+        #(module class name, hw, sw) --> number of configuration, like keys of ModConfig.table
+        self.index = dict(((tools[t].__name__, tuple(h), tuple(s)), i)
+                          for i, (t, h, s) in enumerate(zip(self.tools, self.hw, self.sw)))
+
+    def __len__(self):
+        return len(self.tools)
+
+    def module(self, i):
+        ''':returns: module with configuration i.'''
+        return tools[self.tools[i]](self.num, list(self.hw[i]), list(self.sw[i]))
+
+    def find(self, m):
+        ''':returns: number of configuration of module m, -1 for HWRC20 modules.'''
+        return self.index.get((m.__class__.__name__, tuple(m.hw), tuple(m.sw)), -1)
+
+def configTable(conf):
+    '''
+    :param conf: object of class 'ModConfig'.
+    :returns: object of class 'ConfigTable' for module, it's computed once and kept in conf.arrays.
+    '''
+    if conf.arrays == None:
+        conf.arrays = ConfigTable(conf)
+    return conf.arrays
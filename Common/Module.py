@@ -2,6 +2,50 @@ import random
 import math
 from Common.Schedule import Task, Link
 
+# Probabilities of failure of fault-tolerance mechanisms.
+# Arguments are probabilities of correct work (Q) and failure (P) of components.
+# They may be numbers or numpy arrays (see Common.Kernels).
+def failNVP01(Qhw, Phw, Qsw0, Psw0, Qsw1, Psw1, Psw2, Qrv, Prv, Qd, Pd, Qall, Pall):
+    return (Prv +
+            Qrv * Prv +
+            Qrv * Qrv * Prv +
+            Qrv * Qrv * Qrv * Pd +
+            Qrv * Qrv * Qrv * Qd * Pall +
+            Qrv * Qrv * Qrv * Qd * Qall * Phw +
+            Qrv * Qrv * Qrv * Qd * Qall * Qhw * Psw0 * Psw1 +
+            Qrv * Qrv * Qrv * Qd * Qall * Qhw * Qsw0 * Psw1 * Psw2 +
+            Qrv * Qrv * Qrv * Qd * Qall * Qhw * Qsw1 * Psw0 * Psw2)
+
+def failNVP11(Qhw0, Phw0, Qhw1, Phw1, Qhw2, Phw2, Qsw0, Psw0, Qsw1, Psw1, Qsw2, Psw2, Qrv, Prv, Qrv3, Qd, Pd, Qall, Pall):
+    return (Prv +
+            Qrv * Prv +
+            Qrv * Qrv * Prv +
+            Qrv3 * Pd +
+            Qrv3 * Qd * Pall +
+            Psw0 * Psw1 * Qrv3 * Qd * Qall +
+            Psw0 * Psw2 * Qsw1 * Qrv3 * Qd * Qall +
+            Psw2 * Psw1 * Qsw0 * Qrv3 * Qd * Qall +
+            Psw0 * Phw0 * Phw1 * Qsw1 * Qsw2 * Qrv3 * Qd * Qall * Qhw2 +
+            Qrv3 * Qd * Qall * Phw0 * Phw2 * Qhw1 * Qsw2 * (1 - Psw0 * Psw1) +
+            Psw2 * Phw0 * Phw2 * Qsw0 * Qsw1 * Qrv3 * Qd * Qall * Qhw1 +
+            Qrv3 * Qd * Qall * Phw1 * Phw2 * Qhw0 * Qsw1 * (1 - Psw0 * Psw2) +
+            Psw1 * Phw1 * Phw2 * Qsw0 * Qsw2 * Qrv3 * Qd * Qall * Qhw0 +
+            Qrv3 * Qd * Qall * Phw0 * Phw1 * Qhw2 * Qsw0 * (1 - Psw2 * Psw1) +
+            Qrv3 * Qd * Qall * Psw0 * Qhw0 * Qsw1 * Qhw1 * Qsw2 * Phw2 +
+            Qrv3 * Qd * Qall * Psw0 * Qhw0 * Qsw1 * Phw1 * Qsw2 * Qhw2 +
+            Qrv3 * Qd * Qall * Qsw0 * Qhw0 * Psw1 * Qhw1 * Qsw2 * Phw2 +
+            Qrv3 * Qd * Qall * Qsw0 * Phw0 * Psw1 * Qhw1 * Qsw2 * Qhw2 +
+            Qrv3 * Qd * Qall * Qsw0 * Qhw0 * Qsw1 * Phw1 * Psw2 * Qhw2 +
+            Qrv3 * Qd * Qall * Qsw0 * Phw0 * Qsw1 * Qhw1 * Psw2 * Qhw2)
+
+def failRB11(Phw0, Phw1, Psw0, Psw1, Qrv, Prv, Qd, Pd, Qall, Pall):
+    return (Prv +
+            Qrv * Pd +
+            Qrv * Qd * Pall +
+            Qrv * Qd * Qall * Phw0 * Phw1 +
+            Qrv * Qd * Qall * (1 - Phw0 * Phw1) * Psw0 * Psw1)
+
+
 class Module:
     '''Base class for system module.
     :param num: Number of module.
@@ -17,15 +61,22 @@ class Module:
         self.cost = -1
         self.relL = -1.0
         self.relR = -1.0
-        self._computeRel()
-        self._computeCost()
-        self._computeExecTime()
-        self.conf.modules[self.num].type = self.__class__.__name__
+        # every configuration of module is computed only once, then it's taken from table
+        key = (self.__class__.__name__, tuple(hw), tuple(sw))
+        table = self.conf.modules[self.num].table
+        values = table.get(key)
+        if values == None:
+            self._computeRel()
+            self._computeCost()
+            self._computeExecTime()
+            table[key] = (self.relL, self.relR, self.cost, self.execTime)
+        else:
+            self.relL, self.relR, self.cost, self.execTime = values
 
     def __eq__(self, other):
         '''Operator ==
         '''
-        return self.num ==  other.num and self.hw == other.hw and self.sw == other.sw
+        return self.__class__ == other.__class__ and self.num == other.num and self.hw == other.hw and self.sw == other.sw
 
 class NONE(Module):
     '''Class for module with NONE mechanism.
@@ -33,9 +84,12 @@ class NONE(Module):
     :param hw: List of used HW versions. DO NOT USE -1 FOR ABSENT VERSIONS! MUST CONTAIN 0 OR 1 ELEMENT.
     :param sw: List of used SW versions. DO NOT USE -1 FOR ABSENT VERSIONS! MUST CONTAIN 0 OR 1 ELEMENT.
 
-    If len(hw) == 0  and len(sw) == 0 module is generated randomly.
+    If len(hw) == 0  and len(sw) == 0 module is generated randomly
+    (from not dominated configurations if they are pruned, see SysConfig.pruneConfigs).
     '''
     def __init__(self, num, hw = [], sw = []):
+        if hw == [] and sw == [] and self.conf.modules[num].menuConfigs("none") != []:
+            hw, sw = random.choice(self.conf.modules[num].menuConfigs("none"))
         if hw == [] and sw == []:
             hw = [random.randint(0, len(self.conf.modules[num].hw)-1)]
             sw = [random.randint(0, len(self.conf.modules[num].sw)-1)]
@@ -64,6 +118,8 @@ class NONE(Module):
 
 class NVP01(Module):
     def __init__(self, num, hw=[], sw=[]):
+        if hw == [] and sw == [] and self.conf.modules[num].menuConfigs("nvp01") != []:
+            hw, sw = random.choice(self.conf.modules[num].menuConfigs("nvp01"))
         if hw == [] and sw == []:
             hw = [random.randint(0, len(self.conf.modules[num].hw)-1)]
             sw1 = random.randint(0, len(self.conf.modules[num].sw)-3)
@@ -101,26 +157,9 @@ class NVP01(Module):
         PallL = 1 - QallR
         PallR = 1 - QallL
 
-        PL = (PrvL +
-              QrvL * PrvL +
-              QrvL * QrvL * PrvL +
-              QrvL * QrvL * QrvL * PdL +
-              QrvL * QrvL * QrvL * QdL * PallL +
-              QrvL * QrvL * QrvL * QdL * QallL * PhwL +
-              QrvL * QrvL * QrvL * QdL * QallL * QhwL * Psw0L * Psw1L +
-              QrvL * QrvL * QrvL * QdL * QallL * QhwL * Qsw0L * Psw1L * Psw2L +
-              QrvL * QrvL * QrvL * QdL * QallL * QhwL * Qsw1L * Psw0L * Psw2L)
-
-        PR = (PrvR +
-              QrvR * PrvR +
-              QrvR * QrvR * PrvR +
-              QrvR * QrvR * QrvR * PdR +
-              QrvR * QrvR * QrvR * QdR * PallR +
-              QrvR * QrvR * QrvR * QdR * QallR * PhwR +
-              QrvR * QrvR * QrvR * QdR * QallR * QhwR * Psw0R * Psw1R +
-              QrvR * QrvR * QrvR * QdR * QallR * QhwR * Qsw0R * Psw1R * Psw2R +
-              QrvR * QrvR * QrvR * QdR * QallR * QhwR * Qsw1R * Psw0R * Psw2R)
-        
+        PL = failNVP01(QhwL, PhwL, Qsw0L, Psw0L, Qsw1L, Psw1L, Psw2L, QrvL, PrvL, QdL, PdL, QallL, PallL)
+        PR = failNVP01(QhwR, PhwR, Qsw0R, Psw0R, Qsw1R, Psw1R, Psw2R, QrvR, PrvR, QdR, PdR, QallR, PallR)
+
         self.relL = 1 - PR
         self.relR = 1 - PL
 
@@ -145,6 +184,8 @@ class NVP01(Module):
 
 class NVP11(Module):
     def __init__(self, num, hw = [], sw = []):
+        if hw == [] and sw == [] and self.conf.modules[num].menuConfigs("nvp11") != []:
+            hw, sw = random.choice(self.conf.modules[num].menuConfigs("nvp11"))
         if hw == [] and sw == []:
             hw = [random.randint(0, len(self.conf.modules[num].hw)-1),
                   random.randint(0, len(self.conf.modules[num].hw)-1),
@@ -194,48 +235,9 @@ class NVP11(Module):
         Qrv3L = QrvL ** 3
         Qrv3R = QrvR ** 3
 
-        PL = (PrvL +
-              QrvL * PrvL +
-              QrvL * QrvL * PrvL +
-              Qrv3L * PdL +
-              Qrv3L * QdL * PallL +
-              Psw0L * Psw1L * Qrv3L * QdL * QallL +
-              Psw0L * Psw2L * Qsw1L * Qrv3L * QdL * QallL +
-              Psw2L * Psw1L * Qsw0L * Qrv3L * QdL * QallL +
-              Psw0L * Phw0L * Phw1L * Qsw1L * Qsw2L * Qrv3L * QdL * QallL * Qhw2L +
-              Qrv3L * QdL * QallL * Phw0L * Phw2L * Qhw1L * Qsw2L * (1 - Psw0L * Psw1L) +
-              Psw2L * Phw0L * Phw2L * Qsw0L * Qsw1L * Qrv3L * QdL * QallL * Qhw1L +
-              Qrv3L * QdL * QallL * Phw1L * Phw2L * Qhw0L * Qsw1L * (1 - Psw0L * Psw2L) +
-              Psw1L * Phw1L * Phw2L * Qsw0L * Qsw2L * Qrv3L * QdL * QallL * Qhw0L +
-              Qrv3L * QdL * QallL * Phw0L * Phw1L * Qhw2L * Qsw0L * (1 - Psw2L * Psw1L) +
-              Qrv3L * QdL * QallL * Psw0L * Qhw0L * Qsw1L * Qhw1L * Qsw2L * Phw2L +
-              Qrv3L * QdL * QallL * Psw0L * Qhw0L * Qsw1L * Phw1L * Qsw2L * Qhw2L +
-              Qrv3L * QdL * QallL * Qsw0L * Qhw0L * Psw1L * Qhw1L * Qsw2L * Phw2L +
-              Qrv3L * QdL * QallL * Qsw0L * Phw0L * Psw1L * Qhw1L * Qsw2L * Qhw2L +
-              Qrv3L * QdL * QallL * Qsw0L * Qhw0L * Qsw1L * Phw1L * Psw2L * Qhw2L +
-              Qrv3L * QdL * QallL * Qsw0L * Phw0L * Qsw1L * Qhw1L * Psw2L * Qhw2L)
-
-        PR = (PrvR +
-              QrvR * PrvR +
-              QrvR * QrvR * PrvR +
-              Qrv3R * PdR +
-              Qrv3R * QdR * PallR +
-              Psw0R * Psw1R * Qrv3R * QdR * QallR +
-              Psw0R * Psw2R * Qsw1R * Qrv3R * QdR * QallR +
-              Psw2R * Psw1R * Qsw0R * Qrv3R * QdR * QallR +
-              Psw0R * Phw0R * Phw1R * Qsw1R * Qsw2R * Qrv3R * QdR * QallR * Qhw2R +
-              Qrv3R * QdR * QallR * Phw0R * Phw2R * Qhw1R * Qsw2R * (1 - Psw0R * Psw1R) +
-              Psw2R * Phw0R * Phw2R * Qsw0R * Qsw1R * Qrv3R * QdR * QallR * Qhw1R +
-              Qrv3R * QdR * QallR * Phw1R * Phw2R * Qhw0R * Qsw1R * (1 - Psw0R * Psw2R) +
-              Psw1R * Phw1R * Phw2R * Qsw0R * Qsw2R * Qrv3R * QdR * QallR * Qhw0R +
-              Qrv3R * QdR * QallR * Phw0R * Phw1R * Qhw2R * Qsw0R * (1 - Psw2R * Psw1R) +
-              Qrv3R * QdR * QallR * Psw0R * Qhw0R * Qsw1R * Qhw1R * Qsw2R * Phw2R +
-              Qrv3R * QdR * QallR * Psw0R * Qhw0R * Qsw1R * Phw1R * Qsw2R * Qhw2R +
-              Qrv3R * QdR * QallR * Qsw0R * Qhw0R * Psw1R * Qhw1R * Qsw2R * Phw2R +
-              Qrv3R * QdR * QallR * Qsw0R * Phw0R * Psw1R * Qhw1R * Qsw2R * Qhw2R +
-              Qrv3R * QdR * QallR * Qsw0R * Qhw0R * Qsw1R * Phw1R * Psw2R * Qhw2R +
-              Qrv3R * QdR * QallR * Qsw0R * Phw0R * Qsw1R * Qhw1R * Psw2R * Qhw2R)
-        
+        PL = failNVP11(Qhw0L, Phw0L, Qhw1L, Phw1L, Qhw2L, Phw2L, Qsw0L, Psw0L, Qsw1L, Psw1L, Qsw2L, Psw2L, QrvL, PrvL, Qrv3L, QdL, PdL, QallL, PallL)
+        PR = failNVP11(Qhw0R, Phw0R, Qhw1R, Phw1R, Qhw2R, Phw2R, Qsw0R, Psw0R, Qsw1R, Psw1R, Qsw2R, Psw2R, QrvR, PrvR, Qrv3R, QdR, PdR, QallR, PallR)
+
         self.relL = 1 - PR
         self.relR = 1 - PL
 
@@ -279,6 +281,8 @@ class NVP11(Module):
 
 class RB11(Module):
     def __init__(self, num, hw = [], sw = []):
+        if hw == [] and sw == [] and self.conf.modules[num].menuConfigs("rb11") != []:
+            hw, sw = random.choice(self.conf.modules[num].menuConfigs("rb11"))
         if hw == [] and sw == []:
             hw = [random.randint(0, len(self.conf.modules[num].hw)-1),
                   random.randint(0, len(self.conf.modules[num].hw)-1)]
@@ -318,18 +322,9 @@ class RB11(Module):
         Qrv3L = QrvL ** 3
         Qrv3R = QrvR ** 3
 
-        PL = (PrvL +
-              QrvL * PdL +
-              QrvL * QdL * PallL +
-              QrvL * QdL * QallL * Phw0L * Phw1L +
-              QrvL * QdL * QallL * (1 - Phw0L * Phw1L) * Psw0L * Psw1L)
-
-        PR = (PrvR +
-              QrvR * PdR +
-              QrvR * QdR * PallR +
-              QrvR * QdR * QallR * Phw0R * Phw1R +
-              QrvR * QdR * QallR * (1 - Phw0R * Phw1R) * Psw0R * Psw1R)
-        
+        PL = failRB11(Phw0L, Phw1L, Psw0L, Psw1L, QrvL, PrvL, QdL, PdL, QallL, PallL)
+        PR = failRB11(Phw0R, Phw1R, Psw0R, Psw1R, QrvR, PrvR, QdR, PdR, QallR, PallR)
+
         self.relL = 1 - PR
         self.relR = 1 - PL
 
@@ -372,6 +367,10 @@ class RB11(Module):
 # survives initial self fault and then fault of first reserve module
 # if second reserve fails there's no reconfiguration
 class HWRC20(Module):
+    '''Class for module with HWRC20 mechanism.
+    Reliability depends on other HWRC20 modules of reconfiguration zone in the system, so module is created
+    with reliability of the only HWRC20 module of its zone, the system sets actual one (see zoneRel).
+    '''
     def __init__(self, num, hw=[], sw=[]):
         if hw == [] and sw == []:
             hw = [random.randint(0, len(self.conf.modules[num].hw)-1)]
@@ -379,6 +378,13 @@ class HWRC20(Module):
         Module.__init__(self, num, hw, sw)
 
     def _computeRel(self):
+        self.relL, self.relR = self.zoneRel(())
+
+    def zoneRel(self, members):
+        '''Computes reliability of module in reconfiguration zone.
+        :param members: sorted tuple of numbers of other HWRC20 modules of the zone in the system.
+        :returns: tuple (relL, relR).
+        '''
         QhwrcL = self.conf.hwrc_relL
         QhwrcR = self.conf.hwrc_relR
         PhwrcL = 1 - QhwrcR
@@ -390,51 +396,13 @@ class HWRC20(Module):
         QswL = self.conf.modules[self.num].sw[0].relL
         QswR = self.conf.modules[self.num].sw[0].relR
 
-        # modules that partake in reconfiguration after initial fault (self fault)
-        zone_0 = []
-        for i in self.conf.modules:
-            if ((i != self.conf.modules[self.num]) and
-                    (self.__class__.__name__ == i.type) and
-                    (i.hwrc_zone_num == self.conf.modules[self.num].hwrc_zone_num)):
-                zone_0.append(i)
-        # probability of failure after initial reconfiguration
-        P_post_reconf_1L = 0.0
-        P_post_reconf_1R = 0.0
-        if len(zone_0) > 0:
-            for j in zone_0:
-                # modules that partake in reconfiguration after second fault (j fault)
-                zone_1 = []
-                for i in zone_0:
-                    if ((i != j) and
-                            (i != self.conf.modules[self.num]) and
-                            (j.type == i.type) and
-                            (i.hwrc_zone_num == j.hwrc_zone_num)):
-                        zone_1.append(i)
-                # probability of failure after second reconfiguration
-                P_post_reconf_2L = 0.0
-                P_post_reconf_2R = 0.0
-                if len(zone_1) > 0:
-                    for k in zone_1:
-                        P_post_reconf_2L += 1 - k.hw[0].relR
-                        P_post_reconf_2R += 1 - k.hw[0].relL
-                    P_post_reconf_2L /= len(zone_1)
-                    P_post_reconf_2R /= len(zone_1)
-                else:
-                    P_post_reconf_2L = 1.0
-                    P_post_reconf_2R = 1.0
-                P_post_reconf_1L += (1 - j.hw[0].relR) * (PhwrcL + QhwrcL * P_post_reconf_2L)
-                P_post_reconf_1R += (1 - j.hw[0].relL) * (PhwrcR + QhwrcR * P_post_reconf_2R)
-            P_post_reconf_1L /= len(zone_0)
-            P_post_reconf_1R /= len(zone_0)
-        else:
-            P_post_reconf_1L = 1.0
-            P_post_reconf_1R = 1.0
+        # probability of failure after initial reconfiguration (self fault)
+        P_post_reconf_1L, P_post_reconf_1R = self.conf.hwrcPostReconf(self.num, members)
         PL = PhwL * (PhwrcL + QhwrcL * P_post_reconf_1L)
         PR = PhwR * (PhwrcR + QhwrcR * P_post_reconf_1R)
         QL = 1 - PR
         QR = 1 - PL
-        self.relL = QL * QswL
-        self.relR = QR * QswR
+        return QL * QswL, QR * QswR
 
     def toSchedule(self, schedule):
         '''Adds elements, corresponding to module to schedule.
@@ -449,4 +417,7 @@ class HWRC20(Module):
         self.execTime = self.conf.modules[self.num].times[self.sw[0]][self.hw[0]]
 
     def __str__(self):
-        return "\t" + str(self.num) + ". HWRC20:" + str(self.hw) + str(self.sw) + "\n"
\ No newline at end of file
+        return "\t" + str(self.num) + ". HWRC20:" + str(self.hw) + str(self.sw) + "\n"
+
+# tool name (as in config) --> module class
+tools = {"none": NONE, "nvp01": NVP01, "nvp11": NVP11, "rb11": RB11, "hwrc20": HWRC20}
@@ -0,0 +1,97 @@
+'''Execution of independent algorithm runs in parallel processes.
+'''
+import multiprocessing, os, random, sys, copy
+from Common.Module import Module
+from Common.Algorithm import Algorithm
+from Common.System import System
+
+#configuration of the worker process, every run starts with its copy
+_conf = None
+_algconf = None
+
+def _initWorker(conf, algconf, constraints):
+    '''Sets class-level configuration in worker process.'''
+    global _conf, _algconf
+    _conf = conf
+    _algconf = algconf
+    System.constraints = constraints
+    # archive file is written only by the main process
+    if _algconf.archive != None:
+        _algconf.archive.readonly = True
+
+def resetMetamodel(algconf):
+    '''Clears metamodel before run. If persistent archive is used,
+    metamodel is trained on archived simulation results then, so the run starts warm.'''
+    if not algconf.metamodel:
+        return
+    algconf.metamodel.Clear()
+    if algconf.archive != None and algconf.use_metamodel:
+        for s in algconf.archive.systems():
+            algconf.metamodel.add(s)
+        algconf.metamodel.Update()
+
+def _runOnce(args):
+    '''Makes one run in worker process.
+    :param args: tuple (algorithm class, seed).
+    :returns: pair (object of class 'Execution', new results of archive), see Archive.pending.
+    '''
+    cls, seed = args
+    random.seed(seed)
+    # algorithms change current parameters in algconf and module types in conf,
+    # so runs shouldn't depend on previous runs of the worker
+    Module.conf = copy.deepcopy(_conf)
+    Algorithm.algconf = copy.deepcopy(_algconf)
+    Algorithm.algconf.simcache = _algconf.simcache
+    Algorithm.algconf.archive = _algconf.archive
+    resetMetamodel(Algorithm.algconf)
+    algorithm = cls()
+    algorithm.Run()
+    # simulation files are named by pid, so every worker has its own ones
+    try:
+        os.remove("sch" + str(os.getpid()) + ".xml")
+        os.remove("res" + str(os.getpid()) + ".xml")
+    except:
+        pass
+    results = []
+    if _algconf.archive != None:
+        results = _algconf.archive.pending
+        _algconf.archive.pending = []
+    return algorithm.stat.execs[-1], results
+
+def runExecutions(algorithm, num, callback=None):
+    '''
+    Runs algorithm num times. Runs are made in Algorithm.algconf.processes processes
+    (1 - in this process, 0 - number of CPUs). Every run gets its own seed.
+    Persistent archive (Algorithm.algconf.archive) is shared by runs: workers only read it
+    and send new simulation results to this process, which writes them after every run.
+    Executions are collected in algorithm.stat, algorithm.currentSolution is the solution of the last run.
+    :param algorithm: object of subclass of 'Algorithm'.
+    :param num: number of runs.
+    :param callback: function called with algorithm after every run.
+    '''
+    processes = Algorithm.algconf.processes
+    if processes == 1 or num <= 1 or algorithm.multiprocess:
+        for i in range(num):
+            resetMetamodel(algorithm.algconf)
+            algorithm.Run()
+            if algorithm.algconf.archive != None:
+                algorithm.algconf.archive.Flush()
+            if callback:
+                callback(algorithm)
+        return
+    if processes == 0:
+        processes = multiprocessing.cpu_count()
+    seeds = [random.randint(0, sys.maxint) for i in range(num)]
+    pool = multiprocessing.Pool(min(processes, num), _initWorker, (Module.conf, Algorithm.algconf, System.constraints))
+    try:
+        for ex, results in pool.imap(_runOnce, [(algorithm.__class__, seed) for seed in seeds]):
+            if Algorithm.algconf.archive != None:
+                Algorithm.algconf.archive.extend(results)
+                Algorithm.algconf.archive.Flush()
+            algorithm.stat.AddExecution(ex)
+            algorithm.currentSolution = ex.solution
+            if callback:
+                callback(algorithm)
+    finally:
+        pool.close()
+        pool.join()
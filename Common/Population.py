@@ -0,0 +1,122 @@
+'''Compact representation of systems.
+Every system is a row of integers: for every module there are tool id,
+3 hw versions and 3 sw versions (-1 for unused ones).
+It's used to send systems between processes (see GA.Islands).
+Class Population keeps systems as rows of numpy array for batch evaluation, it requires numpy.
+'''
+try:
+    import numpy
+except ImportError:
+    numpy = None
+from Common.Module import Module, NONE, NVP01, NVP11, RB11, HWRC20
+from Common.Kernels import configTable
+from Common.Constraints import CostConstraints, TimeConstraints
+
+#tool id --> module class
+classes = [NONE, NVP01, NVP11, RB11, HWRC20]
+#number of integers for one module
+WIDTH = 7
+
+def encode(system):
+    '''Converts system to list of integers.'''
+    res = []
+    for m in system.modules:
+        res.append(classes.index(m.__class__))
+        res.extend(m.hw + [-1] * (3 - len(m.hw)))
+        res.extend(m.sw + [-1] * (3 - len(m.sw)))
+    return res
+
+def decodeModules(row):
+    '''Converts row of integers to list of modules.'''
+    modules = []
+    for num in range(len(row) / WIDTH):
+        gene = row[num * WIDTH:(num + 1) * WIDTH]
+        cls = classes[int(gene[0])]
+        hw = [int(h) for h in gene[1:4] if h >= 0]
+        sw = [int(s) for s in gene[4:7] if s >= 0]
+        modules.append(cls(num, hw, sw))
+    return modules
+
+class Population:
+    '''
+    Array-backed store of systems for batch evaluation (see System.Evaluate).
+    Every system is a row of numbers of configurations of its modules in Kernels.configTable,
+    -1 is used for modules which aren't in the table (HWRC20), their values are taken from modules.
+    Reliability, cost, times and penalty of systems are kept in columns near the rows.
+    Values are computed in the same order as System computes them, so they are the same.
+    Systems themselves aren't changed, System.Evaluate writes values back.
+    :param systems: list of systems.
+    '''
+    def __init__(self, systems):
+        self.systems = systems
+        self.size = len(systems)
+        self.tables = [configTable(conf) for conf in Module.conf.modules]
+        self.rows = numpy.array([[t.find(m) for t, m in zip(self.tables, s.modules)] for s in systems],
+                                dtype=numpy.int32).reshape(self.size, len(self.tables))
+        self.relL = None
+        self.relR = None
+        #cost of modules without cost of HWRC, number of HWRC20 modules and cost of systems
+        self.modCost = None
+        self.hwrcNum = None
+        self.cost = None
+        self.times = None
+        self.penalty = None
+
+    def __column(self, num, values, attr, dtype):
+        '''
+        :param values: array of values of configurations of module 'num' (relL, relR or cost of its table).
+        :param attr: attribute of module with the same value.
+        :returns: array of values of module 'num' of all systems.
+        '''
+        codes = self.rows[:, num]
+        res = numpy.zeros(self.size, dtype=dtype)
+        known = codes >= 0
+        res[known] = values[codes[known]]
+        for i in numpy.nonzero(~known)[0]:
+            res[i] = getattr(self.systems[i].modules[num], attr)
+        return res
+
+    def computeRel(self):
+        '''Computes reliability of systems, product of reliabilities of modules.
+        Reliability of HWRC20 modules must be already set (see System.__setZoneRel).'''
+        self.relL = numpy.ones(self.size)
+        self.relR = numpy.ones(self.size)
+        for num, t in enumerate(self.tables):
+            self.relL *= self.__column(num, t.relL, "relL", float)
+            self.relR *= self.__column(num, t.relR, "relR", float)
+
+    def computeCost(self):
+        '''Computes cost of systems: cost of modules and cost of HWRC if there are HWRC20 modules.'''
+        self.modCost = numpy.zeros(self.size, dtype=numpy.int64)
+        for num, t in enumerate(self.tables):
+            self.modCost += self.__column(num, t.cost, "cost", numpy.int64)
+        self.hwrcNum = numpy.zeros(self.size, dtype=numpy.int64)
+        for i, num in zip(*numpy.nonzero(self.rows < 0)):
+            if isinstance(self.systems[i].modules[num], HWRC20):
+                self.hwrcNum[i] += 1
+        hwrcCost = numpy.array([s.hwrc_cost for s in self.systems], dtype=numpy.int64)
+        self.cost = self.modCost + numpy.where(self.hwrcNum > 0, hwrcCost, 0)
+
+    def readTimes(self):
+        '''Takes times of modules from systems (after they are simulated or estimated).'''
+        self.times = numpy.array([[m.time for m in s.modules] for s in self.systems],
+                                 dtype=float).reshape(self.rows.shape)
+
+    def computePenalty(self, constraints):
+        '''
+        Computes penalty of systems like System.ComputePenalty, cost and times must be already computed.
+        :param constraints: list of constraints.
+        '''
+        self.penalty = numpy.ones(self.size)
+        for c in constraints:
+            p = numpy.ones(self.size)
+            if isinstance(c, CostConstraints):
+                over = self.cost > c.limitCost
+                p[over] = float(c.limitCost) / self.cost[over]
+            elif isinstance(c, TimeConstraints):
+                for num, l in enumerate(c.limitTimes):
+                    over = self.times[:, num] > l
+                    p[over] *= float(l) / self.times[over, num]
+            else:
+                p = numpy.array([c.GetPenalty(s) for s in self.systems], dtype=float)
+            self.penalty *= p
@@ -18,6 +18,14 @@ class Schedule:
         self.tasks = []
         self.links = []
 
+    def fingerprint(self):
+        '''Returns canonical hashable representation of schedule.
+        Order of tasks and links is kept: it defines order of tasks on processors and
+        order of transfers on the shared channel, so it changes simulated times.'''
+        tasks = tuple((t.id, t.time, t.processor, t.num) for t in self.tasks)
+        links = tuple((l.src, l.dst, l.vol) for l in self.links)
+        return (tasks, links)
+
     def exportXML(self, filename):
         dom = xml.dom.minidom.Document()
         root = dom.createElement("schedule")
@@ -0,0 +1,36 @@
+from collections import OrderedDict
+
+class SimCache:
+    '''Bounded LRU cache.
+    It's used for simulation results (key is a schedule fingerprint, see Schedule.fingerprint,
+    value is list of module times) and for fitness of systems (key is a chromosome, see System.chromosome).
+    :param maxsize: maximum number of stored results. 0 disables cache.
+    '''
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        '''Returns stored value or None. Found value becomes the most recently used.'''
+        value = self.items.pop(key, None)
+        if value == None:
+            self.misses += 1
+            return None
+        self.items[key] = value
+        self.hits += 1
+        return value
+
+    def add(self, key, value):
+        if self.maxsize <= 0:
+            return
+        self.items.pop(key, None)
+        self.items[key] = value
+        while len(self.items) > self.maxsize:
+            self.items.popitem(last=False)
+
+    def Clear(self):
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
@@ -2,12 +2,14 @@ from Common.Constraints import CostConstraints, RelConstraints, TimeConstraints
 
 class Execution:
     '''Class for statistics of one execution'''
-    def __init__(self, solution, iter, time, timecounts, simcounts):
+    def __init__(self, solution, iter, time, timecounts, simcounts, simhits=0, fithits=0):
         self.solution = solution
         self.iter = iter
         self.time = time
         self.timecounts = timecounts
         self.simcounts = simcounts
+        self.simhits = simhits
+        self.fithits = fithits
 
 class Statistics:
     def __init__(self):
@@ -29,7 +31,7 @@ class Statistics:
             elif isinstance(c, TimeConstraints):
                 f.write("Limit Times:;")
                 f.write(str(c.limitTimes))
-        f.write("\nNum;RelL;RelR;Cost;Times;IterNum;Time(sec);GetTime_num;Sim_num;\n")
+        f.write("\nNum;RelL;RelR;Cost;Times;IterNum;Time(sec);GetTime_num;Sim_num;Sim_hits;Fit_hits;\n")
         num = 0
         minRelL = maxRelL = self.execs[0].solution.relL
         sumRelL = 0.0
@@ -41,6 +43,10 @@ class Statistics:
         sumtc = 0
         minsc = maxsc = self.execs[0].simcounts
         sumsc = 0
+        minsh = maxsh = self.execs[0].simhits
+        sumsh = 0
+        minfh = maxfh = self.execs[0].fithits
+        sumfh = 0
         mintime = maxtime = self.execs[0].time
         sumtime = 0
         for e in self.execs:
@@ -49,6 +55,8 @@ class Statistics:
             sumIter += e.iter
             sumtc += e.timecounts
             sumsc += e.simcounts
+            sumsh += e.simhits
+            sumfh += e.fithits
             sumtime += e.time
             if e.solution.relL > maxRelL:
                 maxRelL = e.solution.relL
@@ -66,6 +74,14 @@ class Statistics:
                 maxsc = e.simcounts
             elif e.simcounts < minsc:
                 minsc = e.simcounts
+            if e.simhits > maxsh:
+                maxsh = e.simhits
+            elif e.simhits < minsh:
+                minsh = e.simhits
+            if e.fithits > maxfh:
+                maxfh = e.fithits
+            elif e.fithits < minfh:
+                minfh = e.fithits
             if e.timecounts > maxtc:
                 maxtc = e.timecounts
             elif e.timecounts < mintc:
@@ -86,13 +102,17 @@ class Statistics:
             f.write(str(e.iter)+";")
             f.write(str(e.time)+";")
             f.write(str(e.timecounts)+";")
-            f.write(str(e.simcounts)+";\n")
+            f.write(str(e.simcounts)+";")
+            f.write(str(e.simhits)+";")
+            f.write(str(e.fithits)+";\n")
             num += 1
-        f.write(";\nMin relL:;Max relL:;Avg relL:;Min relR:;Max relR:;Avg relR:;Min iter:;Max iter:;Avg iter:;Min tc:;Max tc:;Avg tc:;Min sc:;Max sc:;Avg sc:;Min time:;Max time:;Avg time:;\n")
+        f.write(";\nMin relL:;Max relL:;Avg relL:;Min relR:;Max relR:;Avg relR:;Min iter:;Max iter:;Avg iter:;Min tc:;Max tc:;Avg tc:;Min sc:;Max sc:;Avg sc:;Min sh:;Max sh:;Avg sh:;Min fh:;Max fh:;Avg fh:;Min time:;Max time:;Avg time:;\n")
         f.write(str(minRelL)+";"+str(maxRelL)+";"+str(sumRelL/num)+";"+
                 str(minRelR) + ";" + str(maxRelR) + ";" + str(sumRelR / num) + ";" +
                 str(minIter)+";"+str(maxIter)+";"+str(sumIter/num)+";"+
                 str(mintc)+";"+str(maxtc)+";"+str(sumtc/num)+";"+
                 str(minsc)+";"+str(maxsc)+";"+str(sumsc/num)+";"+
+                str(minsh)+";"+str(maxsh)+";"+str(sumsh/num)+";"+
+                str(minfh)+";"+str(maxfh)+";"+str(sumfh/num)+";"+
                 str(mintime)+";"+str(maxtime)+";"+str(sumtime/num)+";")
         f.close()
\ No newline at end of file
@@ -1,4 +1,4 @@
-import xml.dom.minidom, random, math
+import xml.dom.minidom, random, math, itertools, hashlib
 
 class Component:
     def __init__(self, num, relL=0.0, relR=0.0, cost=0):
@@ -27,7 +27,6 @@ class ModConfig:
         self.qdR = -1.0
         self.qallR = -1.0
         self.hwrc_zone_num = -1
-        self.type = ""
         self.tvote = 0
         self.ttest = 0
         self.trecov = 0
@@ -36,6 +35,13 @@ class ModConfig:
         self.dep = []
         self.input = 0
         self.output = 0
+        #(tool, hw, sw) --> (relL, relR, cost, execTime), see Module
+        self.table = {}
+        #all configurations as arrays, see Kernels.configTable
+        self.arrays = None
+        #tool --> not dominated configurations (hw, sw), None if configurations aren't pruned
+        #(see SysConfig.pruneConfigs)
+        self.menu = None
 
     def GetConfigsNum(self):
         res = 0
@@ -53,6 +59,41 @@ class ModConfig:
             res += hw_num**2 * math.factorial(sw_num) /(2 * math.factorial(sw_num - 2))
         return res
 
+    def GetConfigs(self, tool):
+        '''Enumerates all configurations of module with tool 'tool'.
+        Their total number for all tools is counted by GetConfigsNum.
+        :returns: list of pairs (hw, sw) of lists of used versions.'''
+        hw = range(len(self.hw))
+        sw = range(len(self.sw))
+        if tool == "none" or tool == "hwrc20":
+            return [([h], [s]) for h in hw for s in sw]
+        if tool == "nvp01":
+            return [([h], list(s)) for h in hw for s in itertools.combinations(sw, 3)]
+        if tool == "nvp11":
+            return [(list(h), list(s)) for h in itertools.product(hw, repeat=3)
+                    for s in itertools.combinations(sw, 3)]
+        if tool == "rb11":
+            return [(list(h), list(s)) for h in itertools.product(hw, repeat=2)
+                    for s in itertools.combinations(sw, 2)]
+        return []
+
+    def menuConfigs(self, tool):
+        '''
+        :returns: list of not dominated configurations (hw, sw) with tool 'tool'.
+        Empty list means that configurations of the tool aren't pruned, so new module is generated randomly.
+        '''
+        if self.menu == None:
+            return []
+        return self.menu.get(tool, [])
+
+    def menuTools(self):
+        '''
+        :returns: list of tools which have configurations after pruning (all tools if they aren't pruned).
+        '''
+        if self.menu == None:
+            return self.tools
+        return [t for t in self.tools if t not in self.menu or self.menu[t] != []]
+
     def timeInterval(self):
         '''Computes minimum and maximum execution times for module.
         Maximum time is estimated approximately.
@@ -194,6 +235,15 @@ class SysConfig:
         self.limitcost = []
         self.limitrel = []
         self.terminals = []
+        self.order = []
+        #(zone num, zone members) --> failure probabilities after reconfiguration
+        self.hwrcCache = {}
+        #pairs (number of configurations, number of not dominated ones) for modules
+        #and not dominated configurations of modules, see pruneConfigs
+        self.pruneStats = None
+        self.menus = []
+        #hash of the content which defines simulated times, see fingerprint
+        self.hash = None
 
     def findLink(self, src, dst):
         for l in self.links:
@@ -247,6 +297,98 @@ class SysConfig:
             max_time.append(m.max_time)
         return (min_time, max_time)
 
+    def pruneConfigs(self):
+        '''Removes dominated configurations of modules (they're kept in ModConfig.menu),
+        so new modules are generated only from the rest ones.
+        Configuration is dominated if other configuration of the module (with any tool)
+        has not greater cost and execution time and not lower relL and relR.
+        Execution time is the time of module on its own, without waiting for previous modules and transfers,
+        so pruning is exact for reliability and cost, but only approximate for time constraints.
+        HWRC20 configurations aren't pruned: their reliability depends on other modules of reconfiguration zone.
+        Configurations are evaluated by Common.Kernels if numpy is installed.
+        Pruning is made once for configuration, statistics is printed then.
+        :returns: pruneStats.
+        '''
+        if self.pruneStats == None:
+            from Common.Module import tools
+            from Common.Core import paretoFrontTimed
+            from Common import Kernels
+            self.pruneStats = []
+            for m in self.modules:
+                items = []
+                m.menu = {}
+                if Kernels.available():
+                    t = Kernels.configTable(m)
+                    for i in range(len(t)):
+                        items.append((int(t.cost[i]), float(t.relL[i]), float(t.relR[i]), int(t.execTime[i]),
+                                      t.tools[i], t.hw[i], t.sw[i]))
+                for tool in m.tools:
+                    if tool == "hwrc20":
+                        continue
+                    m.menu[tool] = []
+                    if not Kernels.available():
+                        for hw, sw in m.GetConfigs(tool):
+                            mod = tools[tool](m.num, hw, sw)
+                            items.append((mod.cost, mod.relL, mod.relR, mod.execTime, tool, hw, sw))
+                kept = paretoFrontTimed(items)
+                for x in kept:
+                    m.menu[x[4]].append((x[5], x[6]))
+                self.pruneStats.append((m.GetConfigsNum(), m.GetConfigsNum() - len(items) + len(kept)))
+            self.menus = [m.menu for m in self.modules]
+            total = 1.0
+            left = 1.0
+            for num, rest in self.pruneStats:
+                total *= num
+                left *= rest
+            print "Not dominated configurations of modules: ", \
+                " ".join(str(rest) + "/" + str(num) for num, rest in self.pruneStats)
+            print "Search space: %g of %g" % (left, total)
+        for m, menu in zip(self.modules, self.menus):
+            m.menu = menu
+        return self.pruneStats
+
+    def unpruneConfigs(self):
+        '''Makes all configurations of modules available again (statistics and pruned menus are kept).'''
+        for m in self.modules:
+            m.menu = None
+
+    def hwrcPostReconf(self, num, members):
+        '''Computes probability of failure of HWRC20 module 'num' after initial reconfiguration.
+        Other HWRC20 modules of its zone partake in reconfiguration after initial fault,
+        and the rest of them after the second fault. Results are cached for every state of zone.
+        :param members: sorted tuple of numbers of other HWRC20 modules of the zone.
+        :returns: tuple (PL, PR).'''
+        zone = self.modules[num].hwrc_zone_num
+        key = (zone, members)
+        res = self.hwrcCache.get(key)
+        if res != None:
+            return res
+        n = len(members)
+        if n == 0:
+            res = (1.0, 1.0)
+        else:
+            PhwrcL = 1 - self.hwrc_relR
+            PhwrcR = 1 - self.hwrc_relL
+            failL = [1 - self.modules[i].hw[0].relR for i in members]
+            failR = [1 - self.modules[i].hw[0].relL for i in members]
+            sumL = sum(failL)
+            sumR = sum(failR)
+            PL = 0.0
+            PR = 0.0
+            for fL, fR in zip(failL, failR):
+                # probability of failure after second reconfiguration (averaged over the rest of zone)
+                if n > 1:
+                    P2L = (sumL - fL) / (n - 1)
+                    P2R = (sumR - fR) / (n - 1)
+                else:
+                    P2L = 1.0
+                    P2R = 1.0
+                PL += fL * (PhwrcL + self.hwrc_relL * P2L)
+                PR += fR * (PhwrcR + self.hwrc_relR * P2R)
+            res = (PL / n, PR / n)
+        self.hwrcCache[key] = res
+        return res
+
     def loadXML(self, fileName):
         self.modules = []
         self.links = []
@@ -392,6 +534,34 @@ class SysConfig:
                 res.append(m.num)
         return res
 
+    def __getOrder(self):
+        '''Returns numbers of modules in topological order (every module goes after all its previous modules)'''
+        res = []
+        indegree = [len(m.src) for m in self.modules]
+        ready = [m.num for m in self.modules if indegree[m.num] == 0]
+        while ready != []:
+            num = ready.pop(0)
+            res.append(num)
+            for d in self.modules[num].dst:
+                indegree[d[0].num] -= 1
+                if indegree[d[0].num] == 0:
+                    ready.append(d[0].num)
+        return res
+
+    def fingerprint(self):
+        '''Returns hash of the content which defines simulated module times:
+        execution times of versions, times of voting, testing and recovery, links.
+        Reliabilities, costs and limits don't change simulated times, so they aren't taken into account.
+        Order of links is kept: it's order of transfers on the channel (see Schedule.fingerprint).
+        It's computed once for configuration.'''
+        if self.hash == None:
+            content = []
+            for m in self.modules:
+                content.append((m.num, m.tvote, m.ttest, m.trecov, [list(t) for t in m.times]))
+            content.append([(l.src.num, l.dst.num, l.vol) for l in self.links])
+            self.hash = hashlib.sha1(repr(content)).hexdigest()
+        return self.hash
+
     def getLimitTimes(self):
         '''Returns time constraints'''
         res = []
@@ -413,7 +583,13 @@ class SysConfig:
 
     def __buildConfig(self):
         '''Prepares some service data'''
+        self.hwrcCache = {}
+        self.pruneStats = None
+        self.hash = None
         for m in self.modules:
+            m.table = {}
+            m.arrays = None
+            m.menu = None
             m.src = self.__getSrc(m)
             m.dst = self.__getDst(m)
             self.__getModDependencies(m)
@@ -424,5 +600,6 @@ class SysConfig:
             for m1 in m.dst:
                 m.output += m1[1]
         self.terminals = self.__getTerminals()
+        self.order = self.__getOrder()
 
 
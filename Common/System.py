@@ -1,8 +1,10 @@
-import random, os, xml.dom.minidom, sys
+import random, os, xml.dom.minidom, sys, copy
 from Common.Module import NONE, NVP01, NVP11, RB11, HWRC20, Module
 from Common.Algorithm import Algorithm
 from Common.Schedule import Schedule, Link
 from Common.Constraints import TimeConstraints
+from Common.Population import Population
+from Common import Timecounter, Kernels
 import itertools
 
 class System:
@@ -20,6 +22,14 @@ class System:
         self.hwrc_cost = -1
         self.hwrc_relL = -1.0
         self.hwrc_relR = -1.0
+        #running values for replaceModule (modCost == None means they aren't computed yet)
+        self.modCost = None
+        self.hwrcNum = 0
+        self.replaced = 0
+        #times and penalty need to be updated
+        self.dirty = False
+        #cached sort keys of GA (key function --> value)
+        self.keys = {}
 
     def __eq__(self, other):
         if other == None:
@@ -29,6 +39,47 @@ class System:
                 return False
         return True
 
+    def chromosome(self):
+        '''
+        :returns: tuple of (tool, hw versions, sw versions) of every module.
+        '''
+        return tuple((m.__class__.__name__, tuple(m.hw), tuple(m.sw)) for m in self.modules)
+
+    def __hash__(self):
+        return hash(self.chromosome())
+
+    def copy(self):
+        '''
+        Copies system. Modules aren't copied: they are shared by copies and never changed in place
+        (module with new time or reliability is replaced by its copy, see __setTime and __setZoneRel),
+        so only the list is copied.
+        :returns: new system.
+        '''
+        s = System()
+        s.__dict__.update(self.__dict__)
+        s.modules = list(self.modules)
+        s.keys = dict(self.keys)
+        return s
+
+    def __setTime(self, num, time):
+        '''
+        Sets time of module 'num'. The module may be shared with other systems,
+        so it is replaced by its copy with new time.
+        '''
+        m = self.modules[num]
+        if m.time != time:
+            m = copy.copy(m)
+            m.time = time
+            self.modules[num] = m
+
+    def setEstimatedTimes(self, times):
+        '''
+        Sets module times estimated by metamodel.
+        :param times: list of times of modules.
+        '''
+        for num in range(len(times)):
+            self.__setTime(num, times[num])
+
     def distance(self, other):
         '''
         :param other: other system.
@@ -40,56 +91,193 @@ class System:
                 res += 1
         return res
 
+    def __setZoneRel(self):
+        '''
+        Sets reliability of HWRC20 modules: it depends on other HWRC20 modules of the same reconfiguration zone.
+        Modules may be shared with other systems, so changed ones are replaced by copies (see __setTime).
+        '''
+        zones = {}
+        for m in self.modules:
+            if isinstance(m, HWRC20):
+                zones.setdefault(Module.conf.modules[m.num].hwrc_zone_num, []).append(m.num)
+        for nums in zones.values():
+            for num in nums:
+                m = self.modules[num]
+                relL, relR = m.zoneRel(tuple(n for n in nums if n != num))
+                if m.relL != relL or m.relR != relR:
+                    m = copy.copy(m)
+                    m.relL = relL
+                    m.relR = relR
+                    self.modules[num] = m
+
     def __computeRel(self):
+        self.__setZoneRel()
         self.relL = 1.0
         self.relR = 1.0
         for m in self.modules:
             self.relL *= m.relL
             self.relR *= m.relR
+        self.replaced = 0
 
     def __computeCost(self):
+        self.modCost = 0
+        self.hwrcNum = 0
+        for m in self.modules:
+            if isinstance(m, HWRC20):
+                self.hwrcNum += 1
+            self.modCost += m.cost
+        self.__setCost()
+
+    def __setCost(self):
         self.cost = 0
-        hasHWRRC20 = False
-        for i in self.modules:
-            if i.__class__.__name__ == "HWRC20":
-                hasHWRRC20 = True
-        if hasHWRRC20:
+        if self.hwrcNum > 0:
             self.cost += self.hwrc_cost
-        for m in self.modules:
-            self.cost += m.cost
+        self.cost += self.modCost
 
     def __computeTime(self, use_metamodel=True, add=True):
+        '''
+        :returns: True if times are estimated (by metamodel, critical path or screening),
+        such times mustn't be kept in fitness cache as exact ones.
+        '''
         #for m in self.modules:
         #   s = Module.conf.metamodel.search(self, m.num)
         Algorithm.timecounts += 1
-        l = []
-        if not any(isinstance(c, TimeConstraints) for c in self.constraints):
-            return
+        limits = None
+        for c in self.constraints:
+            if isinstance(c, TimeConstraints):
+                limits = c.limitTimes
+        if limits == None:
+            # times aren't needed, so fitness is exact
+            return False
+        if Algorithm.algconf.time_method == "cpath":
+            self.getTimesCPath(Algorithm.algconf.cpath_upper)
+            return True
+        if Algorithm.algconf.time_method == "screen" and not self.__nearDeadline(limits):
+            return True
         if not use_metamodel or not Algorithm.algconf.use_metamodel:
             self.getTimesSim()
             if Algorithm.algconf.use_metamodel and add:
                 Algorithm.algconf.metamodel.add(self)
-            return
-        if not Algorithm.algconf.metamodel.getTime(self):
+            return False
+        estimate = Algorithm.algconf.metamodel.estimate(self)
+        if estimate == None or self.__uncertain(estimate, limits):
             self.getTimesSim()
             if add:
                 Algorithm.algconf.metamodel.add(self)
+            return False
+        self.setEstimatedTimes([t for t, d in estimate])
+        return True
+
+    def __uncertain(self, estimate, limits):
+        '''
+        Checks if metamodel estimate can't tell whether time constraints are satisfied:
+        distance from estimated time of some module to its deadline is within
+        algconf.uncertainty_band standard deviations.
+        :param estimate: list of pairs (time, deviation), see Metamodel.estimate.
+        :param limits: list of deadlines.
+        '''
+        band = Algorithm.algconf.uncertainty_band
+        if band <= 0:
+            return False
+        for (t, d), l in zip(estimate, limits):
+            if abs(l - t) <= band * d:
+                return True
+        return False
+
+    def __computeFitness(self, use_metamodel=True, add=True):
+        '''
+        Computes times and penalty (reliability and cost must be already computed).
+        Exactly evaluated systems are kept in fitness cache (Algorithm.algconf.fitcache)
+        by chromosome, so if exact evaluation is needed they are taken from it.
+        '''
+        if self.__fitnessFromCache(use_metamodel):
+            return
+        estimated = self.__computeTime(use_metamodel, add)
+        self.ComputePenalty()
+        if not estimated:
+            self.__fitnessToCache()
+
+    def __fitnessFromCache(self, use_metamodel):
+        '''
+        Takes reliability, times and penalty from fitness cache if exact evaluation is needed.
+        :returns: True if system is found in cache.
+        '''
+        if use_metamodel and Algorithm.algconf.use_metamodel:
+            return False
+        entry = Algorithm.algconf.fitcache.get((self.chromosome(), self.hwrc_cost))
+        if entry == None:
+            return False
+        #times are requested as without cache, saved computations are counted by fithits
+        Algorithm.timecounts += 1
+        Algorithm.fithits += 1
+        relL, relR, cost, times, penalty = entry
+        self.relL = relL
+        self.relR = relR
+        for num in range(len(times)):
+            self.__setTime(num, times[num])
+        self.penalty = penalty
+        self.keys = {}
+        return True
+
+    def __fitnessToCache(self):
+        '''Keeps exactly evaluated system in fitness cache.'''
+        Algorithm.algconf.fitcache.add((self.chromosome(), self.hwrc_cost),
+                                       (self.relL, self.relR, self.cost, [m.time for m in self.modules], self.penalty))
+
+    def __nearDeadline(self, limits):
+        '''
+        Screens time constraints with critical path bounds of simulated times (see getTimesCPath).
+        Leaves estimated times in modules if constraints are surely satisfied (upper bound meets every deadline)
+        or surely violated (lower bound exceeds some deadline by more than algconf.screen_margin).
+        Satisfaction of constraints is decided exactly then, but times and penalty are only estimates.
+        :param limits: list of deadlines.
+        :returns: True if simulation is needed.
+        '''
+        self.getTimesCPath(upper=True)
+        if all(m.time <= l for m, l in zip(self.modules, limits)):
+            return False
+        self.getTimesCPath()
+        margin = Algorithm.algconf.screen_margin
+        if any(m.time > l * (1 + margin) for m, l in zip(self.modules, limits)):
+            return False
+        return True
 
-    def __computeModTime(self, l, num):
-        if l[num]:
+    def getTimesCPath(self, upper=False):
+        '''
+        Estimates module times by the longest path in the modules graph.
+        By default it's lower bound of simulated times: module starts after data from every previous module
+        is received (execution of previous module and transfer of this link only, other transfers
+        of previous module may be made later) and finishes after own execution and all own transfers.
+        :param upper: if True, module starts after execution of its latest previous module and
+        every transfer of the schedule is considered to delay every module because of the single shared channel.
+        That gives upper bound of simulated times.
+        '''
+        times = [0] * len(self.modules)
+        if upper:
+            delay = 0
+            for l in self.toSchedule().links:
+                delay += l.vol
+            for num in Module.conf.order:
+                conf = Module.conf.modules[num]
+                start = 0
+                for m in conf.src:
+                    if times[m.num] > start:
+                        start = times[m.num]
+                times[num] = start + self.modules[num].execTime
+            for num in range(len(times)):
+                self.__setTime(num, times[num] + delay)
             return
-        start = 0
-        for m in Module.conf.modules[num].src:
-            n = Module.conf.modules.index(m)
-            self.__computeModTime(l, n)
-            end = self.modules[n].time
-            if end > start:
-                start = end
-        transfer = 0
-        for d in Module.conf.modules[num].dst:
-            transfer += d[1]
-        self.modules[num].time = start + self.modules[num].execTime + transfer
-        l[num] = True
+        #time when all input data of module is received
+        start = [0] * len(self.modules)
+        for num in Module.conf.order:
+            conf = Module.conf.modules[num]
+            finish = start[num] + self.modules[num].execTime
+            for m, vol in conf.dst:
+                if finish + vol > start[m.num]:
+                    start[m.num] = finish + vol
+            times[num] = finish + conf.output
+        for num in range(len(times)):
+            self.__setTime(num, times[num])
 
     def Update(self, use_metamodel=True, add=True):
         '''
@@ -100,13 +288,120 @@ class System:
         '''
         self.__computeCost()
         self.__computeRel()
-        #self.__computeTime(use_metamodel, add)
-        self.ComputePenalty()
+        self.__computeFitness(use_metamodel, add)
+        self.dirty = False
+
+    def replaceModule(self, k, new, update=True, use_metamodel=True, add=True):
+        '''
+        Replaces module 'k' with 'new' and updates reliability and cost in O(1).
+        Reliability is divided by the factor of replaced module, so it is recomputed
+        exactly if that factor is zero or after modNum replacements (not to accumulate error).
+        It's recomputed also if HWRC20 module is replaced or added: reliability of its zone changes.
+        :param update: if times and penalty should be updated too.
+        Otherwise call Refresh() or Evaluate() after all replacements. Until then times are unknown,
+        so penalty is computed without time constraints: it's an upper bound, which GA uses
+        to truncate population after crossover without evaluating times.
+        '''
+        old = self.modules[k]
+        self.modules[k] = new
+        self.dirty = True
+        self.keys = {}
+        if self.modCost != None:
+            self.modCost += new.cost - old.cost
+            if isinstance(old, HWRC20):
+                self.hwrcNum -= 1
+            if isinstance(new, HWRC20):
+                self.hwrcNum += 1
+            self.__setCost()
+            self.replaced += 1
+            if (isinstance(old, HWRC20) or isinstance(new, HWRC20) or
+                    old.relL == 0 or old.relR == 0 or self.replaced >= len(self.modules)):
+                self.__computeRel()
+            else:
+                self.relL = self.relL / old.relL * new.relL
+                self.relR = self.relR / old.relR * new.relR
+        if update:
+            self.Refresh(use_metamodel, add)
+        elif self.modCost != None:
+            self.ComputePenalty(times=False)
+
+    def Refresh(self, use_metamodel=True, add=True):
+        '''
+        Updates times and penalty after replaceModule.
+        '''
+        if not self.dirty:
+            return
+        if self.modCost == None:
+            self.Update(use_metamodel, add)
+            return
+        self.__computeFitness(use_metamodel, add)
+        self.dirty = False
+
+    @staticmethod
+    def Evaluate(systems, use_metamodel=True, add=True):
+        '''
+        Evaluation stage of GA: evaluates systems changed by operators (they only mark systems
+        by replaceModule(update=False)), every system once even if it is in the list several times.
+        Reliability, cost and penalty of all changed systems are computed at once in arrays
+        of configurations (see Population and Kernels), so reliability accumulated by replaceModule
+        is replaced by exact one. Times are taken from fitness cache or computed one system after another
+        (simulation can't be vectorized). Without numpy systems are evaluated one by one (see Refresh).
+        :param systems: list of systems.
+        :param use_metamodel: if metamodel is used.
+        :param add: if we should add new solutions to metamodel base.
+        '''
+        batch = []
+        done = set()
+        for s in systems:
+            if s.dirty and id(s) not in done:
+                done.add(id(s))
+                batch.append(s)
+        if batch == []:
+            return
+        if not Kernels.available():
+            for s in batch:
+                s.Refresh(use_metamodel, add)
+            return
+        for s in batch:
+            if s.modCost == None or s.hwrcNum > 0:
+                s.__setZoneRel()
+        pop = Population(batch)
+        pop.computeRel()
+        pop.computeCost()
+        for i, s in enumerate(batch):
+            s.relL = float(pop.relL[i])
+            s.relR = float(pop.relR[i])
+            s.modCost = int(pop.modCost[i])
+            s.hwrcNum = int(pop.hwrcNum[i])
+            s.__setCost()
+            s.replaced = 0
+        #None for systems taken from cache, otherwise if times are estimated
+        estimated = []
+        for s in batch:
+            if s.__fitnessFromCache(use_metamodel):
+                estimated.append(None)
+            else:
+                estimated.append(s.__computeTime(use_metamodel, add))
+        pop.readTimes()
+        pop.computePenalty(System.constraints)
+        for i, s in enumerate(batch):
+            if estimated[i] != None:
+                s.penalty = float(pop.penalty[i])
+                s.keys = {}
+                if not estimated[i]:
+                    s.__fitnessToCache()
+            s.dirty = False
 
-    def ComputePenalty(self):
+    def ComputePenalty(self, times=True):
+        '''
+        Computes penalty for violated constraints.
+        :param times: if time constraints are taken into account (without them penalty isn't lower than exact one).
+        '''
+        self.keys = {}
         self.penalty = 1.0
         for c in self.constraints:
-            self.penalty *= c.GetPenalty(self)
+            if times or not isinstance(c, TimeConstraints):
+                self.penalty *= c.GetPenalty(self)
 
     def CheckConstraints(self):
         '''
@@ -127,7 +422,7 @@ class System:
         for j in range(Algorithm.algconf.maxGenIter):
             self.modules = []
             for i in range(Module.conf.modNum):
-                type = random.choice(Module.conf.modules[i].tools)
+                type = random.choice(Module.conf.modules[i].menuTools())
                 if type == "none":
                     self.modules.append(NONE(i))
                 elif type == "nvp01":
@@ -160,7 +455,8 @@ class System:
 
     def toSchedule(self):
         '''
-        Generates xml-file with schedule for self
+        Generates schedule for self.
+        :returns: object of class 'Schedule'.
         '''
         sch = Schedule()
         for m in self.modules:
@@ -174,39 +470,76 @@ class System:
                 src_str = "t" + str(src.num)
             if isinstance(src, NVP11) or isinstance(src, RB11):
                 src_str = "t" + str(src.num) + "_snd"
-            if isinstance(dst, NONE) or isinstance(src, HWRC20)  or isinstance(dst, NVP01):
+            if isinstance(dst, NONE) or isinstance(dst, HWRC20)  or isinstance(dst, NVP01):
                 dst_str = "t" + str(dst.num)
             if isinstance(dst, NVP11) or isinstance(dst, RB11):
                 dst_str = "t" + str(dst.num) + "_rcv"
             sch.links.append(Link(src_str, dst_str, l.vol))
-        filename = "sch" + str(os.getpid()) + ".xml"
-        sch.exportXML(filename)
+        return sch
 
     def getTimesSim(self):
         '''
         Runs simulation experiment for self and finds module times.
+        Results are taken from simulation cache or persistent archive (Algorithm.algconf.archive) if possible.
         '''
+        sch = self.toSchedule()
+        key = sch.fingerprint()
+        times = Algorithm.algconf.simcache.get(key)
+        if times != None:
+            Algorithm.simhits += 1
+            for num in range(len(times)):
+                self.__setTime(num, times[num])
+            return
+        archive = Algorithm.algconf.archive
+        if archive != None:
+            times = archive.get(self)
+            if times != None:
+                Algorithm.simhits += 1
+                for num in range(len(times)):
+                    self.__setTime(num, times[num])
+                Algorithm.algconf.simcache.add(key, times)
+                return
         Algorithm.simcounts += 1
-        self.toSchedule()
+        if Algorithm.algconf.sim_xml:
+            self.__setTimes(self.__simulateXML(sch))
+        else:
+            self.__setTimes(Timecounter.simulate(sch))
+        Algorithm.algconf.simcache.add(key, [m.time for m in self.modules])
+        if archive != None:
+            archive.add(self)
+
+    def __simulateXML(self, schedule):
+        '''
+        Runs simulation in separate process through xml-files.
+        :returns: dictionary task id --> end time.
+        '''
         sch = "sch" + str(os.getpid()) + ".xml"
         res = "res" + str(os.getpid()) + ".xml"
-        #os.system("python Common/Timecounter.py %s %s" % (sch, res))
+        schedule.exportXML(sch)
         if sys.platform.startswith("win"):
             os.system(u"python.exe Common/Timecounter.py %s %s" % (unicode(sch), unicode(res)))
         else:
             os.system("python Common/Timecounter.py %s %s" % (sch, res))
+        times = {}
         f = open(res, "r")
         dom = xml.dom.minidom.parse(f)
         for task in dom.getElementsByTagName("task"):
-            id = task.getAttribute("id")
+            times[task.getAttribute("id")] = int(task.getAttribute("time"))
+        f.close()
+        return times
+
+    def __setTimes(self, times):
+        '''
+        Sets module times from simulation results.
+        :param times: dictionary task id --> end time.
+        '''
+        for id, time in times.items():
             id = id.replace("t","")
-            time = int(task.getAttribute("time"))
             if id.find("_snd") > 0:
                 num = int(id.replace("_snd",""))
-                self.modules[num].time = time
+                self.__setTime(num, time)
                 continue
             if id.find("_") == -1:
                 num = int(id)
-                self.modules[num].time = time
+                self.__setTime(num, time)
                 continue
-        f.close()
\ No newline at end of file
@@ -1,7 +1,7 @@
 __author__ = 'alevtina'
 __doc__ = 'Builds a state chart for schedule, runs it and ' \
           'finds execution times of tasks.'
-import xml.dom.minidom, sys
+import xml.dom.minidom, sys, heapq
 
 class Task:
     def __init__(self, id, time, proc, num):
@@ -47,6 +47,32 @@ class System:
             if l.dst == dst:
                 return l
 
+    def addTask(self, id, time, proc, num):
+        processor = None
+        for p in self.processors:
+            if p.id == proc:
+                processor = p
+                break
+        if processor == None:
+            processor = Processor(proc)
+            self.processors.append(processor)
+        processor.tasks.append(Task(id, time, proc, num))
+
+    def addLink(self, src, dst, vol):
+        link = Link(src, dst, vol)
+        src_task = self.findTaskById(src)
+        dst_task = self.findTaskById(dst)
+        if src_task.proc == dst_task.proc:
+            return
+        src_task.output_links.append(link)
+        dst_task.previous_tasks.append(src_task)
+
+    def prepare(self):
+        '''Orders tasks on processors. Call it after all tasks and links are added.'''
+        for p in self.processors:
+            p.tasks.sort(key=lambda x: x.num)
+            p.current_task = p.tasks[0]
+
     def loadXML(self, filename):
         f = open(filename, "r")
         dom = xml.dom.minidom.parse(f)
@@ -55,30 +81,30 @@ class System:
             time = task.getAttribute("time")
             proc = task.getAttribute("processor")
             num = task.getAttribute("num")
-            processor = None
-            for p in self.processors:
-                if p.id == proc:
-                    processor = p
-                    break
-            if processor == None:
-                processor = Processor(proc)
-                self.processors.append(processor)
-            processor.tasks.append(Task(id, int(time), proc, int(num)))
+            self.addTask(id, int(time), proc, int(num))
         for link in dom.getElementsByTagName("link"):
             src = link.getAttribute("src")
             dst = link.getAttribute("dst")
             vol = link.getAttribute("vol")
-            link = Link(src, dst, int(vol))
-            src_task = self.findTaskById(src)
-            dst_task = self.findTaskById(dst)
-            if src_task.proc == dst_task.proc:
-                continue
-            src_task.output_links.append(link)
-            dst_task.previous_tasks.append(src_task)
+            self.addLink(src, dst, int(vol))
         f.close()
+        self.prepare()
+
+    def loadSchedule(self, schedule):
+        '''Loading from object of class 'Schedule' without any files.'''
+        for t in schedule.tasks:
+            self.addTask(t.id, t.time, t.processor, t.num)
+        for l in schedule.links:
+            self.addLink(l.src, l.dst, l.vol)
+        self.prepare()
+
+    def getEndTimes(self):
+        '''Returns dictionary task id --> end time.'''
+        res = {}
         for p in self.processors:
-            p.tasks.sort(key=lambda x: x.num)
-            p.current_task = p.tasks[0]
+            for t in p.tasks:
+                res[t.id] = t.end_time
+        return res
 
     def allFinished(self):
         for p in self.processors:
@@ -150,6 +176,81 @@ class System:
             if not changed:
                 self.time += 1
 
+    def work_fast(self):
+        '''Event-driven version of work().
+        Runs the same state machine, but when nothing can change at the current
+        moment it jumps straight to the nearest moment when some task finishes
+        its work or some link finishes its transfer instead of advancing time
+        by one. Task end times are the same as in work().'''
+        events = []
+        unfinished = 0
+        for p in self.processors:
+            for t in p.tasks:
+                t.input_links = []
+                for prev in t.previous_tasks:
+                    link = self.findLinkByDst(prev, t.id)
+                    if not link:
+                        print("Something went wrong")
+                        exit(1)
+                    t.input_links.append(link)
+                unfinished += 1
+        while unfinished > 0:
+            changed = False
+            for p in self.processors:
+                task = p.current_task
+                if not task:
+                    continue
+                if task.state == "WAIT_DATA":
+                    if all(l.transfer_finished for l in task.input_links):
+                        task.state = "WORK"
+                        task.start_work_time = self.time
+                        heapq.heappush(events, self.time + task.time)
+                        changed = True
+                elif task.state == "WORK":
+                    if self.time - task.start_work_time == task.time:
+                        task.state = "WAIT_CHANNEL"
+                        changed = True
+                elif task.state == "WAIT_CHANNEL":
+                    if self.freeChannel:
+                        task.state = "SEND"
+                        task.start_send_time = self.time
+                        self.freeChannel = False
+                        changed = True
+                elif task.state == "SEND":
+                    links = task.output_links
+                    if all(l.transfer_finished for l in links):
+                        task.state = "END"
+                        self.freeChannel = True
+                        changed = True
+                    else:
+                        if links[0].start_time == -1:
+                            links[0].start_time = self.time
+                            heapq.heappush(events, self.time + links[0].vol)
+                        for idx, l in enumerate(links):
+                            if l.start_time != -1 and not l.transfer_finished and self.time - l.start_time == l.vol:
+                                l.transfer_finished = True
+                                changed = True
+                                if idx != len(links) - 1:
+                                    links[idx+1].start_time = self.time
+                                    heapq.heappush(events, self.time + links[idx+1].vol)
+                elif task.state == "END":
+                    task.end_time = self.time
+                    unfinished -= 1
+                    idx = p.tasks.index(task)
+                    if idx != len(p.tasks)-1:
+                        p.current_task = p.tasks[idx+1]
+                        changed = True
+                    else:
+                        p.current_task = None
+            if not changed and unfinished > 0:
+                # nothing else can happen at this moment: skip to the next event
+                while events and events[0] <= self.time:
+                    heapq.heappop(events)
+                if not events:
+                    print("Something went wrong")
+                    exit(1)
+                self.time = heapq.heappop(events)
+
     def exportXML(self, filename):
         f = open(filename, 'w')
         doc = xml.dom.minidom.Document()
@@ -165,8 +266,16 @@ class System:
         f.write(doc.toprettyxml())
         f.close()
 
+def simulate(schedule):
+    '''Runs simulation for object of class 'Schedule' in current process.
+    :returns: dictionary task id --> end time.'''
+    system = System()
+    system.loadSchedule(schedule)
+    system.work_fast()
+    return system.getEndTimes()
+
 if __name__ == "__main__":
     system = System()
     system.loadXML(sys.argv[1])
-    system.work()
+    system.work_fast()
     system.exportXML(sys.argv[2])
\ No newline at end of file
@@ -0,0 +1,205 @@
+from Common.Algorithm import Algorithm
+from Common.System import System
+from Common.Module import Module, tools
+from Common.Constraints import CostConstraints, TimeConstraints
+from Common.Statistics import Execution
+from Common.Core import paretoFront
+import time
+
+class BranchAndBound(Algorithm):
+    '''
+    Exact algorithm for systems with cost and time constraints (for systems up to ~20 modules).
+    Modules are assigned in topological order (SysConfig.order), every node of the search tree
+    chooses configuration of the next module. Node is pruned if:
+    - optimistic reliability (product of chosen reliabilities and the best reliabilities of the rest modules)
+      has lower center than the best found solution;
+    - cost of chosen configurations with the cheapest configurations of the rest modules exceeds cost limit;
+    - lower bound of some module time exceeds its deadline. Bounds are the same as System.getTimesCPath:
+      module starts when every input link is transferred after execution of its source,
+      its time is start, execution time and transfer of all its outputs. Chosen modules use execTime
+      of their configuration, the rest modules use the minimum execTime of their configurations.
+    Solutions found in leaves are evaluated exactly and checked against constraints.
+    Time bounds don't consider the shared channel, so they are loose and with time constraints
+    the search starts with the solution of the fastest configurations.
+    Best solution is chosen by pessimistic extended interval order (center, then width).
+    Search stops after algconf.time_budget seconds, then the best found solution is returned.
+    HWRC20 isn't used (its reliability depends on other modules of the zone). Without time constraints
+    configurations of module dominated by cost and reliability are skipped (see Core.paretoFront).
+    With time constraints all configurations are tried: lower execTime doesn't mean lower simulated times
+    if tool changes tasks and links of the module.
+    '''
+    def __init__(self):
+        Algorithm.__init__(self)
+        self.__clearCounts()
+
+    def __clearCounts(self):
+        self.nodes = 0
+        self.prunedRel = 0
+        self.prunedCost = 0
+        self.prunedTime = 0
+        self.leaves = 0
+        self.timeout = False
+
+    def Clear(self):
+        Algorithm.Clear(self)
+        self.__clearCounts()
+
+    def _configs(self, num, timed):
+        '''
+        :param timed: if there are time constraints (then dominated configurations are kept).
+        :returns: configurations of module num as tuples (cost, relL, relR, execTime, module)
+        sorted by reliability center (the best ones are tried first).
+        '''
+        conf = Module.conf.modules[num]
+        res = []
+        for tool in conf.tools:
+            if tool == "hwrc20":
+                continue
+            for hw, sw in conf.GetConfigs(tool):
+                m = tools[tool](num, hw, sw)
+                res.append((m.cost, m.relL, m.relR, m.execTime, m))
+        if not timed:
+            res = paretoFront(res)
+        res.sort(key=lambda x: (x[1] + x[2], x[1] - x[2]), reverse=True)
+        return res
+
+    def __prepare(self):
+        '''Computes configurations of modules and bounds for the rest modules.'''
+        self.limitCost = None
+        self.limitTimes = None
+        for c in System.constraints:
+            if isinstance(c, CostConstraints):
+                self.limitCost = c.limitCost
+            elif isinstance(c, TimeConstraints):
+                self.limitTimes = c.limitTimes
+        self.order = Module.conf.order
+        n = len(self.order)
+        self.configs = [self._configs(num, self.limitTimes != None) for num in range(Module.conf.modNum)]
+        # input links of modules: list of pairs (source module, volume)
+        self.inputs = [[] for num in range(Module.conf.modNum)]
+        for conf in Module.conf.modules:
+            for m, vol in conf.dst:
+                self.inputs[m.num].append((conf.num, vol))
+        # bounds for modules from position i to the end of order
+        self.restL = [1.0] * (n + 1)
+        self.restR = [1.0] * (n + 1)
+        self.restCost = [0] * (n + 1)
+        for i in range(n - 1, -1, -1):
+            configs = self.configs[self.order[i]]
+            if configs == []:
+                return False
+            self.restL[i] = self.restL[i + 1] * max(c[1] for c in configs)
+            self.restR[i] = self.restR[i + 1] * max(c[2] for c in configs)
+            self.restCost[i] = self.restCost[i + 1] + min(c[0] for c in configs)
+        self.minExec = [min(c[3] for c in configs) for configs in self.configs]
+        if self.limitCost != None and self.restCost[0] >= self.limitCost:
+            return False
+        if self.limitTimes != None and not self.__timeBound(0, [0] * Module.conf.modNum):
+            return False
+        return True
+
+    def __start(self, num, finish):
+        '''
+        :param finish: lower bounds of execution finish of modules.
+        :returns: lower bound of time when all input data of module num is received.
+        '''
+        start = 0
+        for src, vol in self.inputs[num]:
+            if finish[src] + vol > start:
+                start = finish[src] + vol
+        return start
+
+    def __timeBound(self, depth, finish):
+        '''
+        Computes lower bounds of execution finish for modules from position depth in order
+        (ones of previous modules in finish must be already known).
+        :returns: False if some deadline is surely violated.
+        '''
+        for num in self.order[depth:]:
+            finish[num] = self.__start(num, finish) + self.minExec[num]
+            if finish[num] + Module.conf.modules[num].output > self.limitTimes[num]:
+                return False
+        return True
+
+    def __leaf(self):
+        self.leaves += 1
+        s = System()
+        s.modules = list(self.chosen)
+        s.Update(use_metamodel=False)
+        if not s.CheckConstraints():
+            return
+        key = ((s.relL + s.relR) / 2, s.relL - s.relR)
+        if self.bestKey == None or key > self.bestKey:
+            self.bestKey = key
+            self.currentSolution = s
+
+    def __fastest(self):
+        '''
+        Evaluates solution of the fastest configurations of modules (it's the most likely
+        to satisfy time constraints), so the search starts with some solution for pruning.
+        '''
+        for num in range(Module.conf.modNum):
+            self.chosen[num] = min(self.configs[num], key=lambda x: (x[3], x[0], -x[1] - x[2]))[4]
+        if self.limitCost == None or sum(m.cost for m in self.chosen) < self.limitCost:
+            self.__leaf()
+
+    def __search(self, depth, cost, relL, relR, finish):
+        if time.time() > self.deadline:
+            self.timeout = True
+            return
+        if depth == len(self.order):
+            self.__leaf()
+            return
+        num = self.order[depth]
+        conf = Module.conf.modules[num]
+        for mcost, mrelL, mrelR, execTime, m in self.configs[num]:
+            if self.timeout:
+                return
+            self.nodes += 1
+            if self.limitCost != None and cost + mcost + self.restCost[depth + 1] >= self.limitCost:
+                self.prunedCost += 1
+                continue
+            L = relL * mrelL
+            R = relR * mrelR
+            if self.bestKey != None and (L * self.restL[depth + 1] + R * self.restR[depth + 1]) / 2 < self.bestKey[0]:
+                self.prunedRel += 1
+                continue
+            if self.limitTimes != None:
+                finish[num] = self.__start(num, finish) + execTime
+                if finish[num] + conf.output > self.limitTimes[num] or not self.__timeBound(depth + 1, finish):
+                    self.prunedTime += 1
+                    continue
+            self.chosen[num] = m
+            self.__search(depth + 1, cost + mcost, L, R, finish)
+
+    def Run(self):
+        self.Clear()
+        Algorithm.timecounts = 0
+        Algorithm.simcounts = 0
+        Algorithm.simhits = 0
+        Algorithm.fithits = 0
+        Algorithm.algconf.fitcache.Clear()
+        Algorithm.time = time.time()
+        self.deadline = float("inf")
+        if self.algconf.time_budget != None:
+            self.deadline = Algorithm.time + self.algconf.time_budget
+        self.bestKey = None
+        self.chosen = [None] * Module.conf.modNum
+        if self.__prepare():
+            if self.limitTimes != None:
+                self.__fastest()
+            self.__search(0, 0, 1.0, 1.0, [0] * Module.conf.modNum)
+        self.currentIter = self.nodes
+        if self.currentSolution == None:
+            print "No solution satisfies constraints"
+        else:
+            print "Best solution: ", self.currentSolution
+        if self.timeout:
+            print "Time budget is exhausted, solution may be not optimal"
+        print "Nodes: ", self.nodes, " leaves: ", self.leaves
+        print "Pruned by reliability: ", self.prunedRel, " by cost: ", self.prunedCost, " by time: ", self.prunedTime
+        print "--------------------------------------\n"
+        Algorithm.time = time.time() - Algorithm.time
+        if self.currentSolution != None:
+            self.stat.AddExecution(Execution(self.currentSolution, self.currentIter, Algorithm.time, Algorithm.timecounts,
+                                             Algorithm.simcounts, Algorithm.simhits, Algorithm.fithits))
@@ -0,0 +1,301 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+from Common.Algorithm import Algorithm
+from Common.System import System
+from Common.Module import Module, HWRC20
+from Common.Kernels import configTable
+from Common.Constraints import CostConstraints, TimeConstraints
+from Common.Statistics import Execution
+from GA.GA import interval_key_pessimistic_extended, interval_key_optimistic, interval_key_optimistic_left
+from GA.GA_Moore import moore_distance
+import time
+
+#orderings of solutions (see GA keys)
+orderings = ["pessimistic_extended", "optimistic", "optimistic_left", "moore"]
+keys = {"pessimistic_extended": interval_key_pessimistic_extended, "optimistic": interval_key_optimistic,
+        "optimistic_left": interval_key_optimistic_left}
+
+def topIndices(primary, secondary, idx, k):
+    '''
+    :returns: positions of k largest items by (primary, secondary), ties are broken by smaller idx.
+    '''
+    if len(primary) > k:
+        threshold = numpy.partition(primary, len(primary) - k)[len(primary) - k]
+        sel = numpy.nonzero(primary >= threshold)[0]
+    else:
+        sel = numpy.arange(len(primary))
+    order = numpy.lexsort((idx[sel], -secondary[sel], -primary[sel]))
+    return sel[order[:k]]
+
+def frontIndices(left, right, idx):
+    '''
+    :returns: positions of not dominated intervals [left, right] sorted by left bound descending
+    (of equal intervals the one with smaller idx is kept).
+    '''
+    order = numpy.lexsort((idx, -right, -left))
+    r = right[order]
+    best = numpy.maximum.accumulate(r)
+    keep = numpy.ones(len(order), dtype=bool)
+    keep[1:] = r[1:] > best[:-1]
+    return order[keep]
+
+def extremeIndices(relL, relR, k):
+    '''
+    Moore distance from any point is the largest for items with extreme bounds: if item isn't among
+    k items with the largest or the smallest relL or relR, there are k items farther from the point
+    (in the direction of its largest difference). So k farthest items from any point are among them.
+    :returns: sorted positions of k largest and k smallest items of relL and relR (at most 4k positions).
+    '''
+    if len(relL) <= 4 * k:
+        return numpy.arange(len(relL))
+    res = []
+    for v in (relL, relR):
+        order = numpy.argsort(v, kind="mergesort")
+        res += [order[:k], order[-k:]]
+    return numpy.unique(numpy.concatenate(res))
+
+class Exhaustive(Algorithm):
+    '''
+    Exhaustive search: enumerates all combinations of module configurations.
+    It's needed as ground truth for small systems (up to 10^7 combinations or so).
+    Combination number is decoded into configurations of modules (mixed radix, module 0 is the highest digit).
+    Combinations are processed in chunks of algconf.chunk_size, reliability, cost and penalty of the chunk
+    are computed by numpy, so memory doesn't depend on the number of combinations.
+    For every ordering the best algconf.top_num solutions are kept:
+    - "pessimistic_extended", "optimistic" and "optimistic_left" are orders of GA keys
+      (interval_key_pessimistic_extended etc.);
+    - "moore": Moore comparison puts not dominated intervals over dominated ones and among intervals inside one another
+      prefers the farthest one from the current solution. So not dominated intervals are kept and
+      sorted by distance from the current solution. Current solution is known only at the end, so not to keep
+      the whole front, after every chunk only intervals which may be the farthest from any point are kept
+      (see extremeIndices), at most 4 * top_num of them. The Moore list is exact for the front of kept intervals,
+      but an interval dropped from the front of one chunk may be needed if intervals kept instead of it
+      are dominated by later chunks.
+    Time penalty is computed with lower bounds of times (like System.getTimesCPath), because simulation can't be
+    vectorized. Kept solutions are evaluated exactly at the end and sorted again by exact keys,
+    the best pessimistic extended solution satisfying constraints is the current solution.
+    So with time constraints the result is exact only among kept solutions. Penalized reliability estimated
+    with lower bounds of times isn't lower than exact one, so if current solution is better than estimate
+    of every kept solution, no other combination can be better and the result is exact (see self.exact).
+    Reliability of HWRC20 module depends on which other modules of its reconfiguration zone are HWRC20,
+    so it's tabulated for every set of them (see __prepare). Cost of HWRC is taken from configuration (costhwrc).
+    Requires numpy.
+    '''
+    def __init__(self):
+        Algorithm.__init__(self)
+        self.top = {}
+        self.combinations = 0
+        #if current solution is surely the best one
+        self.exact = False
+
+    def Clear(self):
+        Algorithm.Clear(self)
+        self.top = {}
+        self.combinations = 0
+        self.exact = False
+
+    def __prepare(self):
+        '''
+        Makes arrays of configurations of modules. Configurations of every module are configurations
+        of Kernels.configTable followed by HWRC20 ones. Reliability of HWRC20 configurations is kept in table
+        hwrcRelL[num][configuration, mask], bit j of mask is set if module hwrcZone[num][j] is HWRC20 too.
+        '''
+        self.configs = [configTable(conf) for conf in Module.conf.modules]
+        self.hwrcConfigs = []
+        self.hwrcZone = []
+        self.hwrcRelL = []
+        self.hwrcRelR = []
+        self.cost = []
+        self.execTime = []
+        for conf, t in zip(Module.conf.modules, self.configs):
+            configs = []
+            zone = []
+            if "hwrc20" in conf.tools:
+                configs = conf.GetConfigs("hwrc20")
+                zone = [m.num for m in Module.conf.modules if m.num != conf.num and "hwrc20" in m.tools and
+                        m.hwrc_zone_num == conf.hwrc_zone_num]
+            modules = [HWRC20(conf.num, hw, sw) for hw, sw in configs]
+            relL = numpy.zeros((len(modules), 2 ** len(zone)))
+            relR = numpy.zeros((len(modules), 2 ** len(zone)))
+            for mask in range(2 ** len(zone)):
+                members = tuple(num for j, num in enumerate(zone) if mask >> j & 1)
+                for i, m in enumerate(modules):
+                    relL[i, mask], relR[i, mask] = m.zoneRel(members)
+            self.hwrcConfigs.append(configs)
+            self.hwrcZone.append(zone)
+            self.hwrcRelL.append(relL)
+            self.hwrcRelR.append(relR)
+            self.cost.append(numpy.concatenate((t.cost, numpy.array([m.cost for m in modules], dtype=numpy.int64))))
+            self.execTime.append(numpy.concatenate((t.execTime,
+                                                    numpy.array([m.execTime for m in modules], dtype=numpy.int64))))
+        self.sizes = [len(t) + len(c) for t, c in zip(self.configs, self.hwrcConfigs)]
+        self.combinations = 1
+        for size in self.sizes:
+            self.combinations *= size
+        self.limitCost = None
+        self.limitTimes = None
+        for c in System.constraints:
+            if isinstance(c, CostConstraints):
+                self.limitCost = c.limitCost
+            elif isinstance(c, TimeConstraints):
+                self.limitTimes = c.limitTimes
+
+    def __evalChunk(self, start, end):
+        '''
+        :returns: tuple of arrays (idx, relL, relR, penalty) for combinations from start to end.
+        '''
+        idx = numpy.arange(start, end, dtype=numpy.int64)
+        rest = idx.copy()
+        cost = numpy.zeros(len(idx), dtype=numpy.int64)
+        digits = [None] * Module.conf.modNum
+        #if module is HWRC20
+        hwrc = [None] * Module.conf.modNum
+        for num in range(Module.conf.modNum - 1, -1, -1):
+            d = rest % self.sizes[num]
+            rest //= self.sizes[num]
+            digits[num] = d
+            hwrc[num] = d >= len(self.configs[num])
+            cost += self.cost[num][d]
+        relL = numpy.ones(len(idx))
+        relR = numpy.ones(len(idx))
+        for num in range(Module.conf.modNum):
+            d = digits[num]
+            h = hwrc[num]
+            L = numpy.zeros(len(idx))
+            R = numpy.zeros(len(idx))
+            L[~h] = self.configs[num].relL[d[~h]]
+            R[~h] = self.configs[num].relR[d[~h]]
+            if h.any():
+                mask = numpy.zeros(len(idx), dtype=numpy.int64)
+                for j, other in enumerate(self.hwrcZone[num]):
+                    mask |= hwrc[other].astype(numpy.int64) << j
+                L[h] = self.hwrcRelL[num][d[h] - len(self.configs[num]), mask[h]]
+                R[h] = self.hwrcRelR[num][d[h] - len(self.configs[num]), mask[h]]
+            relL *= L
+            relR *= R
+        if any(len(c) > 0 for c in self.hwrcConfigs):
+            cost[numpy.logical_or.reduce(hwrc)] += Module.conf.hwrc_cost
+        penalty = numpy.ones(len(idx))
+        if self.limitCost != None:
+            over = cost > self.limitCost
+            penalty[over] *= float(self.limitCost) / cost[over]
+        if self.limitTimes != None:
+            #time when all input data of module is received
+            begin = [numpy.zeros(len(idx), dtype=numpy.int64) for num in range(Module.conf.modNum)]
+            for num in Module.conf.order:
+                conf = Module.conf.modules[num]
+                finish = begin[num] + self.execTime[num][digits[num]]
+                for m, vol in conf.dst:
+                    begin[m.num] = numpy.maximum(begin[m.num], finish + vol)
+                times = finish + conf.output
+                over = times > self.limitTimes[num]
+                penalty[over] *= float(self.limitTimes[num]) / times[over]
+        return idx, relL, relR, penalty
+
+    def __merge(self, kept, chunk):
+        '''Selects the best combinations of kept ones and chunk for every ordering.'''
+        k = self.algconf.top_num
+        res = {}
+        for name in orderings:
+            idx, relL, relR, penalty = [numpy.concatenate((a, b)) for a, b in zip(kept[name], chunk)]
+            L = penalty * relL
+            R = penalty * relR
+            if name == "pessimistic_extended":
+                sel = topIndices((L + R) / 2, L - R, idx, k)
+            elif name == "optimistic":
+                sel = topIndices(R, R, idx, k)
+            elif name == "optimistic_left":
+                sel = topIndices(L, L, idx, k)
+            else:
+                sel = frontIndices(L, R, idx)
+                sel = sel[extremeIndices(relL[sel], relR[sel], k)]
+            res[name] = (idx[sel], relL[sel], relR[sel], penalty[sel])
+        return res
+
+    def __system(self, i):
+        '''Makes exactly evaluated system for combination i.'''
+        modules = [None] * Module.conf.modNum
+        for num in range(Module.conf.modNum - 1, -1, -1):
+            d = i % self.sizes[num]
+            i //= self.sizes[num]
+            if d < len(self.configs[num]):
+                modules[num] = self.configs[num].module(d)
+            else:
+                hw, sw = self.hwrcConfigs[num][d - len(self.configs[num])]
+                modules[num] = HWRC20(num, list(hw), list(sw))
+        s = System()
+        s.modules = modules
+        if any(len(c) > 0 for c in self.hwrcConfigs):
+            s.hwrc_cost = Module.conf.hwrc_cost
+        s.Update(use_metamodel=False)
+        return s
+
+    def __rank(self, kept):
+        '''
+        Makes exactly evaluated systems of kept combinations and sorts them by exact keys,
+        chooses current solution and checks if it is surely the best one.
+        '''
+        for name in orderings:
+            self.top[name] = [self.__system(int(i)) for i in kept[name][0]]
+            if name in keys:
+                self.top[name].sort(key=keys[name], reverse=True)
+        best = self.top["pessimistic_extended"]
+        feasible = [s for s in best if s.CheckConstraints()]
+        if feasible != []:
+            self.currentSolution = feasible[0]
+        elif best != []:
+            self.currentSolution = best[0]
+        # not dominated intervals (by exact values) sorted by distance from current solution
+        moore = self.top["moore"]
+        if moore != []:
+            L = numpy.array([s.penalty * s.relL for s in moore])
+            R = numpy.array([s.penalty * s.relR for s in moore])
+            moore = [moore[i] for i in frontIndices(L, R, numpy.arange(len(moore)))]
+            if self.currentSolution != None:
+                moore.sort(key=lambda s: moore_distance(s, self.currentSolution), reverse=True)
+            self.top["moore"] = moore[:self.algconf.top_num]
+        # exact values of systems which weren't kept are not better than the worst kept estimate,
+        # and exact and estimated penalties are equal for systems satisfying constraints
+        idx, relL, relR, penalty = kept["pessimistic_extended"]
+        self.exact = len(idx) == self.combinations
+        if not self.exact and feasible != []:
+            s = self.currentSolution
+            self.exact = self.limitTimes == None or (s.relL + s.relR) / 2 > numpy.min(penalty * (relL + relR) / 2)
+
+    def Run(self):
+        if numpy == None:
+            raise ImportError("Exhaustive search requires numpy")
+        self.Clear()
+        Algorithm.timecounts = 0
+        Algorithm.simcounts = 0
+        Algorithm.simhits = 0
+        Algorithm.fithits = 0
+        Algorithm.algconf.fitcache.Clear()
+        Algorithm.time = time.time()
+        self.__prepare()
+        empty = (numpy.zeros(0, dtype=numpy.int64), numpy.zeros(0), numpy.zeros(0), numpy.zeros(0))
+        kept = dict((name, empty) for name in orderings)
+        start = 0
+        while start < self.combinations:
+            end = min(start + self.algconf.chunk_size, self.combinations)
+            kept = self.__merge(kept, self.__evalChunk(start, end))
+            start = end
+        elapsed = time.time() - Algorithm.time
+        self.__rank(kept)
+        self.currentIter = self.combinations
+        for name in orderings:
+            if self.top[name] != []:
+                print "Best solution (" + name + "): ", self.top[name][0]
+        if self.currentSolution == None:
+            print "There are no combinations of modules"
+        elif not self.exact:
+            print "Times are estimated by lower bounds, solution is exact only among kept solutions (topnum)"
+        rate = self.combinations / elapsed if elapsed > 0 else float("inf")
+        print "Combinations: ", self.combinations, " time: %.2f s, combinations/sec: %.0f" % (elapsed, rate)
+        print "--------------------------------------\n"
+        Algorithm.time = time.time() - Algorithm.time
+        if self.currentSolution != None:
+            self.stat.AddExecution(Execution(self.currentSolution, self.currentIter, Algorithm.time, Algorithm.timecounts,
+                                             Algorithm.simcounts, Algorithm.simhits, Algorithm.fithits))
@@ -0,0 +1,90 @@
+from Common.Algorithm import Algorithm
+from Common.System import System
+from Common.Module import Module, tools
+from Common.Constraints import CostConstraints
+from Common.Statistics import Execution
+from Common.Core import paretoFront
+import time
+
+class Knapsack(Algorithm):
+    '''
+    Exact algorithm for systems with cost constraint only.
+    System reliability is the product of module reliabilities and system cost is the sum of module costs,
+    so it is multiple-choice knapsack problem. It's solved by dynamic programming over modules:
+    partial solutions for first k modules are kept if they fit in the cost limit and there's no other one
+    with not greater cost and not lower relL and relR (interval center is monotone in both bounds,
+    so such partial solution can't be a part of the best solution).
+    Best solution is chosen by pessimistic extended interval order (center, then width,
+    see interval_key_pessimistic_extended).
+    HWRC20 isn't used (its reliability depends on other modules of the zone),
+    time constraints aren't considered while searching, result is only checked against them.
+    '''
+    def __init__(self):
+        Algorithm.__init__(self)
+        self.states = 0
+
+    def Clear(self):
+        Algorithm.Clear(self)
+        self.states = 0
+
+    def _configs(self, num):
+        '''
+        :returns: not dominated configurations of module num as tuples (cost, relL, relR, module).
+        '''
+        conf = Module.conf.modules[num]
+        res = []
+        for tool in conf.tools:
+            if tool == "hwrc20":
+                continue
+            for hw, sw in conf.GetConfigs(tool):
+                m = tools[tool](num, hw, sw)
+                res.append((m.cost, m.relL, m.relR, m))
+        return paretoFront(res)
+
+    def Run(self):
+        self.Clear()
+        Algorithm.timecounts = 0
+        Algorithm.simcounts = 0
+        Algorithm.simhits = 0
+        Algorithm.fithits = 0
+        Algorithm.time = time.time()
+        limit = None
+        for c in System.constraints:
+            if isinstance(c, CostConstraints):
+                limit = c.limitCost
+        # partial solution: (cost, relL, relR, (previous modules, module))
+        states = [(0, 1.0, 1.0, None)]
+        for num in range(Module.conf.modNum):
+            configs = self._configs(num)
+            new = []
+            for cost, relL, relR, chain in states:
+                for mcost, mrelL, mrelR, m in configs:
+                    if limit == None or cost + mcost < limit:
+                        new.append((cost + mcost, relL * mrelL, relR * mrelR, (chain, m)))
+            states = paretoFront(new)
+            self.states += len(states)
+            if states == []:
+                break
+        if states == []:
+            print "No solution satisfies cost constraint"
+        else:
+            best = max(states, key=lambda x: ((x[1] + x[2]) / 2, x[1] - x[2]))
+            modules = []
+            chain = best[3]
+            while chain != None:
+                chain, m = chain
+                modules.append(m)
+            modules.reverse()
+            self.currentSolution = System()
+            self.currentSolution.modules = modules
+            self.currentSolution.Update(use_metamodel=False)
+            if not self.currentSolution.CheckConstraints():
+                print "Solution doesn't satisfy time constraints"
+        self.currentIter = Module.conf.modNum
+        print "Best solution: ", self.currentSolution
+        print "Partial solutions: ", self.states
+        print "--------------------------------------\n"
+        Algorithm.time = time.time() - Algorithm.time
+        if self.currentSolution != None:
+            self.stat.AddExecution(Execution(self.currentSolution, self.currentIter, Algorithm.time, Algorithm.timecounts,
+                                             Algorithm.simcounts, Algorithm.simhits, Algorithm.fithits))
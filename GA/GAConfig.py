@@ -16,11 +16,29 @@ class GAConfig(AlgConfig):
         self.Pcross = GAParameter(0.5, 0.75, 1.0)
         self.mutPercent = GAParameter(0.7, 0.8, 0.9)
         self.Pmut = GAParameter(0.5, 0.75, 0.9)
+        #Island model: number of islands (1 - no islands), generations between migrations,
+        #number of migrants from every island and topology ("ring" or "full")
+        self.islands = 1
+        self.migrationInterval = 10
+        self.migrants = 2
+        self.topology = "ring"
+        #Generate modules only from not dominated configurations (see SysConfig.pruneConfigs)
+        self.pruneConfigs = False
 
     def LoadFromXmlNode(self, node):
         AlgConfig.LoadFromXmlNode(self,node)
         self.popNum = int(node.getAttribute("popsize"))
         self.maxIter = int(node.getAttribute("maxiter"))
+        if node.hasAttribute("islands"):
+            self.islands = int(node.getAttribute("islands"))
+        if node.hasAttribute("migrinterval"):
+            self.migrationInterval = int(node.getAttribute("migrinterval"))
+        if node.hasAttribute("migrants"):
+            self.migrants = int(node.getAttribute("migrants"))
+        if node.hasAttribute("topology"):
+            self.topology = node.getAttribute("topology")
+        if node.hasAttribute("prune"):
+            self.pruneConfigs = node.getAttribute("prune") == "True"
         type = node.getAttribute("type")
         for p in node.getElementsByTagName("par"):
             name = p.getAttribute("name")
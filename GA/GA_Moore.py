@@ -74,6 +74,50 @@ def interval_cmp_moore(A, B):
                     else:
                         return -1
 
+class MooreKey:
+    '''
+    Sort key for interval_cmp_moore.
+    Moore comparison isn't the order of any tuple, so the key keeps penalized bounds
+    and distance from g_currSolution and compares them by the same rules.
+    '''
+    def __init__(self, x):
+        self.L = x.penalty * x.relL
+        self.R = x.penalty * x.relR
+        if g_currSolution == None:
+            self.dist = None
+        else:
+            self.dist = moore_distance(x, g_currSolution)
+
+    def __lt__(self, other):
+        AL, AR, BL, BR = self.L, self.R, other.L, other.R
+        if (AL == BL and AR == BR):
+            return False
+        # A is to the right of B
+        if ((AL >= BL and AR > BR) or (AL > BL and AR >= BR)):
+            return False
+        # B is to the right of A
+        if ((AL <= BL and AR < BR) or (AL < BL and AR <= BR)):
+            return True
+        # A and B are included in one another
+        if self.dist == None:
+            return False
+        return self.dist < other.dist
+
+def sort_key_moore(x):
+    '''
+    Key with the same ordering as interval_cmp_moore.
+    It depends on g_currSolution, so it is cached in individual for current g_currSolution bounds.
+    '''
+    if g_currSolution == None:
+        c = (interval_cmp_moore, None)
+    else:
+        c = (interval_cmp_moore, g_currSolution.relL, g_currSolution.relR)
+    k = x.keys.get(c)
+    if k == None:
+        k = MooreKey(x)
+        x.keys[c] = k
+    return k
+
 class GA_Moore(GA):
     def __init__(self):
         Algorithm.__init__(self)
@@ -90,6 +134,13 @@ class GA_Moore(GA):
         self.Clear()
         Algorithm.timecounts = 0
         Algorithm.simcounts = 0
+        Algorithm.simhits = 0
+        Algorithm.fithits = 0
+        Algorithm.algconf.fitcache.Clear()
+        if self.algconf.pruneConfigs:
+            Module.conf.pruneConfigs()
+        else:
+            Module.conf.unpruneConfigs()
         Algorithm.time = time.time()
         for i in range(self.algconf.popNum):
             s = System()
@@ -97,8 +148,8 @@ class GA_Moore(GA):
             self.population.append(s)
         # if intervals are included in one another they are equal
         global g_currSolution
-        g_currSolution = copy.deepcopy(self.currentSolution)
-        self.population.sort(cmp=interval_cmp_moore, reverse=True)
+        g_currSolution = self.currentSolution
+        self.population.sort(key=sort_key_moore, reverse=True)
         while not self._checkStopCondition():
             self.Step()
             #print self.currentIter, self.currentSolution
@@ -106,7 +157,7 @@ class GA_Moore(GA):
         print "--------------------------------------\n"
         Algorithm.time = time.time() - Algorithm.time
         self.stat.AddExecution(Execution(self.currentSolution, self.currentIter, Algorithm.time, Algorithm.timecounts,
-                                         Algorithm.simcounts))
+                                         Algorithm.simcounts, Algorithm.simhits, Algorithm.fithits))
 
     def Clear(self):
         Algorithm.Clear(self)
@@ -121,7 +172,7 @@ class GA_Moore(GA):
                 if self.currentIter > 500 and self.currentSolution == None:
                     type = "none"
                 else:
-                    type = random.choice(Module.conf.modules[k].tools)
+                    type = random.choice(Module.conf.modules[k].menuTools())
                 if type == "none":
                     new = NONE(k)
                 elif type == "nvp01":
@@ -134,8 +185,7 @@ class GA_Moore(GA):
                     new = HWRC20(k)
                     if s.hwrc_cost <= 0:
                         s.hwrc_cost = 50
-                s.modules[k] = new
-                s.Update()
+                s.replaceModule(k, new, update=False)
 
     def _select(self):
         probabilities = []
@@ -148,15 +198,15 @@ class GA_Moore(GA):
             width = s.relR - s.relL
             if val > bestval:
                 bestval = val
-                best_solution = copy.deepcopy(s)
+                best_solution = s
             elif val == bestval and width < best_solution.relR - best_solution.relL:
-                best_solution = copy.deepcopy(s)
+                best_solution = s
         # found solution with the best center
         # now find probabilities
         global g_currSolution
-        g_currSolution = copy.deepcopy(best_solution)
+        g_currSolution = best_solution
         # sort population according to the best solution found in the population
-        self.population.sort(cmp=interval_cmp_moore)
+        self.population.sort(key=sort_key_moore)
         # val is number of solution in sorted temporary population multiplied by its penalty
         i = 1.0
         prev_s = None
@@ -166,19 +216,15 @@ class GA_Moore(GA):
             val = s.penalty * i
             sum += i
             probabilities.append(val)
-            prev_s = copy.deepcopy(s)
+            prev_s = s
         # return current solution back to normal
-        g_currSolution = copy.deepcopy(self.currentSolution)
+        g_currSolution = self.currentSolution
         for p in range(self.algconf.popNum):
             probabilities[p] = probabilities[p] / sum
-        nums = range(self.algconf.popNum)
-        events = dict(zip(nums, probabilities))
-        new_pop = []
-        for i in nums:
-            new_pop.append(self.population[genEvent(events)])
+        new_pop = Sampler(self.population, probabilities).sample(self.algconf.popNum)
         self.population = new_pop
-        g_currSolution = copy.deepcopy(self.currentSolution)
-        self.population.sort(cmp=interval_cmp_moore, reverse=True)
+        g_currSolution = self.currentSolution
+        self.population.sort(key=sort_key_moore, reverse=True)
 
     def _recombine(self):
         if Module.conf.modNum == 1:
@@ -186,64 +232,76 @@ class GA_Moore(GA):
         new_pop = []
         notCrossNum = int((1.0 - self.algconf.crossPercent.cur) * self.algconf.popNum)
         for i in range(notCrossNum):
-            new_pop.append(copy.deepcopy(self.population[i]))
+            new_pop.append(self.population[i].copy())
         for i in range(self.algconf.popNum / 2):
             if random.random() <= self.algconf.Pcross.cur:
                 parents = random.sample(self.population, 2)
                 k = random.randint(1, Module.conf.modNum - 1)
-                child1 = parents[0].modules[0:k] + parents[1].modules[k:Module.conf.modNum]
-                child2 = parents[1].modules[0:k] + parents[0].modules[k:Module.conf.modNum]
-                parents[0].modules = child1
-                parents[1].modules = child2
-                parents[0].Update()
-                parents[1].Update()
+                tail0 = parents[0].modules[k:Module.conf.modNum]
+                tail1 = parents[1].modules[k:Module.conf.modNum]
+                for j in range(len(tail0)):
+                    parents[0].replaceModule(k + j, tail1[j], update=False)
+                    parents[1].replaceModule(k + j, tail0[j], update=False)
+        # children aren't evaluated yet, they are sorted by reliability and cost (see System.replaceModule)
         global g_currSolution
-        g_currSolution = copy.deepcopy(self.currentSolution)
-        self.population.sort(cmp=interval_cmp_moore, reverse=True)
+        g_currSolution = self.currentSolution
+        self.population.sort(key=sort_key_moore, reverse=True)
         new_pop += self.population[:self.algconf.popNum - notCrossNum]
         self.population = new_pop
-        g_currSolution = copy.deepcopy(self.currentSolution)
-        self.population.sort(cmp=interval_cmp_moore, reverse=True)
+        g_currSolution = self.currentSolution
+        self.population.sort(key=sort_key_moore, reverse=True)
+
+    def _checkCandidate(self):
+        '''Simulates candidate chosen with metamodel and makes it current solution if it's better.'''
+        self.candidate.Update(use_metamodel=False)
+        if (self.candidate.CheckConstraints() and
+                (self.currentSolution == None or
+                 interval_cmp_pessimistic_extended(self.candidate, self.currentSolution) >= 0
+                )
+        ):
+            self.currentSolution = self.candidate.copy()
+            self.iterWithoutChange = 0
 
     def _evalPopulation(self):
         global g_currSolution
         self.currentIter += 1
         self.iterWithoutChange += 1
-        g_currSolution = copy.deepcopy(self.currentSolution)
-        self.population.sort(cmp=interval_cmp_moore, reverse=True)
-        not_use_metamodel = Algorithm.algconf.metamodel == None or random.random() <= self.algconf.pop_control_percent
+        self._evaluate()
+        g_currSolution = self.currentSolution
+        self.population.sort(key=sort_key_moore, reverse=True)
+        # with uncertainty band only candidates are simulated (see AlgConfig.uncertainty_band)
+        gating = Algorithm.algconf.metamodel != None and Algorithm.algconf.uncertainty_band > 0
+        not_use_metamodel = Algorithm.algconf.metamodel == None or (not gating and random.random() <= self.algconf.pop_control_percent)
         for s in self.population:
             if not_use_metamodel:
                 if self.candidate:
-                    self.candidate.Update(use_metamodel=False)
-                    if (self.candidate.CheckConstraints() and
-                            (self.currentSolution == None or
-                             interval_cmp_pessimistic_extended(self.candidate, self.currentSolution) >= 0
-                            )
-                    ):
-                        self.currentSolution = copy.deepcopy(self.candidate)
-                        self.iterWithoutChange = 0
-                s.Update(use_metamodel=False)
+                    self._checkCandidate()
+                # changed individuals are already simulated in _evaluate if metamodel isn't used
+                if Algorithm.algconf.metamodel:
+                    s.Update(use_metamodel=False)
                 if (s.CheckConstraints() and
                         (self.currentSolution == None or
                             interval_cmp_pessimistic_extended(s, self.currentSolution) >= 0
                         )
                 ):
-                    self.currentSolution = copy.deepcopy(s)
+                    self.currentSolution = s.copy()
                     self.iterWithoutChange = 0
                     self.candidate = None
                     break
             else:
-                g_currSolution = copy.deepcopy(self.currentSolution)
+                g_currSolution = self.currentSolution
                 if (s.CheckConstraints() and
                         (self.currentSolution == None or
-                         self.candidate == Nonde or
+                         self.candidate == None or
                          interval_cmp_moore(s, self.candidate) >= 0
                         )
                 ):
-                    self.candidate = copy.deepcopy(s)
+                    self.candidate = s.copy()
                     break
-        if not_use_metamodel and Algorithm.algconf.metamodel:
+        if gating and self.candidate:
+            self._checkCandidate()
+            self.candidate = None
+        if (not_use_metamodel or gating) and Algorithm.algconf.metamodel:
             Algorithm.algconf.metamodel.Update()
 
     def _checkStopCondition(self):
@@ -9,19 +9,26 @@ class GA_optimistic_left(GA):
         self.Clear()
         Algorithm.timecounts = 0
         Algorithm.simcounts = 0
+        Algorithm.simhits = 0
+        Algorithm.fithits = 0
+        Algorithm.algconf.fitcache.Clear()
+        if self.algconf.pruneConfigs:
+            Module.conf.pruneConfigs()
+        else:
+            Module.conf.unpruneConfigs()
         Algorithm.time = time.time()
         for i in range(self.algconf.popNum):
             s = System()
             s.GenerateRandom(True)
             self.population.append(s)
-        self.population.sort(key=interval_key_optimistic_left, reverse=True)
+        self.population.sort(key=sort_key_optimistic_left, reverse=True)
         while not self._checkStopCondition():
             self.Step()
             #print self.currentIter, self.currentSolution
         print "Best solution: ", self.currentSolution
         print "--------------------------------------\n"
         Algorithm.time = time.time() - Algorithm.time
-        self.stat.AddExecution(Execution(self.currentSolution, self.currentIter, Algorithm.time, Algorithm.timecounts, Algorithm.simcounts))
+        self.stat.AddExecution(Execution(self.currentSolution, self.currentIter, Algorithm.time, Algorithm.timecounts, Algorithm.simcounts, Algorithm.simhits, Algorithm.fithits))
 
     def _select(self):
         probabilities = []
@@ -32,13 +39,9 @@ class GA_optimistic_left(GA):
             probabilities.append(val)
         for p in range(self.algconf.popNum):
             probabilities[p] = probabilities[p] / sum
-        nums = range(self.algconf.popNum)
-        events = dict(zip(nums, probabilities))
-        new_pop = []
-        for i in nums:
-            new_pop.append(self.population[genEvent(events)])
+        new_pop = Sampler(self.population, probabilities).sample(self.algconf.popNum)
         self.population = new_pop
-        self.population.sort(key=interval_key_optimistic_left, reverse=True)
+        self.population.sort(key=sort_key_optimistic_left, reverse=True)
 
     def _recombine(self):
         if Module.conf.modNum == 1:
@@ -46,47 +49,54 @@ class GA_optimistic_left(GA):
         new_pop = []
         notCrossNum =  int((1.0 - self.algconf.crossPercent.cur) * self.algconf.popNum)
         for i in range(notCrossNum):
-            new_pop.append(copy.deepcopy(self.population[i]))
+            new_pop.append(self.population[i].copy())
         for i in range(self.algconf.popNum/2):
             if random.random() <= self.algconf.Pcross.cur:
                 parents = random.sample(self.population,  2)
                 k = random.randint(1,Module.conf.modNum-1)
-                child1 = parents[0].modules[0:k] + parents[1].modules[k:Module.conf.modNum]
-                child2 = parents[1].modules[0:k] + parents[0].modules[k:Module.conf.modNum]
-                parents[0].modules = child1
-                parents[1].modules = child2
-                parents[0].Update()
-                parents[1].Update()
-        self.population.sort(key=interval_key_optimistic_left, reverse=True)
+                tail0 = parents[0].modules[k:Module.conf.modNum]
+                tail1 = parents[1].modules[k:Module.conf.modNum]
+                for j in range(len(tail0)):
+                    parents[0].replaceModule(k + j, tail1[j], update=False)
+                    parents[1].replaceModule(k + j, tail0[j], update=False)
+        # children aren't evaluated yet, they are sorted by reliability and cost (see System.replaceModule)
+        self.population.sort(key=sort_key_optimistic_left, reverse=True)
         new_pop += self.population[:self.algconf.popNum - notCrossNum]
         self.population = new_pop
-        self.population.sort(key=interval_key_optimistic_left, reverse=True)
+        self.population.sort(key=sort_key_optimistic_left, reverse=True)
+
+    def _checkCandidate(self):
+        '''Simulates candidate chosen with metamodel and makes it current solution if it's better.'''
+        self.candidate.Update(use_metamodel=False)
+        if (self.candidate.CheckConstraints() and
+                (self.currentSolution == None or self.candidate.relL > self.currentSolution.relL
+                )
+        ):
+                self.currentSolution = self.candidate.copy()
+                self.iterWithoutChange = 0
 
     def _evalPopulation(self):
         self.currentIter += 1
         self.iterWithoutChange += 1
-        self.population.sort(key=interval_key_optimistic_left, reverse=True)
-        not_use_metamodel = Algorithm.algconf.metamodel==None or random.random() <= self.algconf.pop_control_percent
+        self._evaluate()
+        self.population.sort(key=sort_key_optimistic_left, reverse=True)
+        # with uncertainty band only candidates are simulated (see AlgConfig.uncertainty_band)
+        gating = Algorithm.algconf.metamodel != None and Algorithm.algconf.uncertainty_band > 0
+        not_use_metamodel = Algorithm.algconf.metamodel==None or (not gating and random.random() <= self.algconf.pop_control_percent)
         for s in self.population:
             if not_use_metamodel:
                 if self.candidate:
-                    self.candidate.Update(use_metamodel=False)
-                    cand_relC = ( self.candidate.relL + self.candidate.relR ) / 2
-                    cand_relW = ( self.candidate.relR - self.candidate.relL )
-                    if (self.candidate.CheckConstraints() and
-                            (self.currentSolution == None or self.candidate.relL > self.currentSolution.relL
-                            )
-                    ):
-                            self.currentSolution = copy.deepcopy(self.candidate)
-                            self.iterWithoutChange = 0
-                s.Update(use_metamodel=False)
+                    self._checkCandidate()
+                # changed individuals are already simulated in _evaluate if metamodel isn't used
+                if Algorithm.algconf.metamodel:
+                    s.Update(use_metamodel=False)
                 s_relC = (s.relL + s.relR) / 2
                 s_relW = (s.relR - s.relL)
                 if (s.CheckConstraints() and
                         (self.currentSolution == None or s.relL > self.currentSolution.relL
                         )
                 ):
-                    self.currentSolution = copy.deepcopy(s)
+                    self.currentSolution = s.copy()
                     self.iterWithoutChange = 0
                     self.candidate = None
                     break
@@ -99,7 +109,10 @@ class GA_optimistic_left(GA):
                          s.relL > self.candidate.relL
                         )
                 ):
-                    self.candidate = copy.deepcopy(s)
+                    self.candidate = s.copy()
                     break
-        if not_use_metamodel and Algorithm.algconf.metamodel:
+        if gating and self.candidate:
+            self._checkCandidate()
+            self.candidate = None
+        if (not_use_metamodel or gating) and Algorithm.algconf.metamodel:
             Algorithm.algconf.metamodel.Update()
\ No newline at end of file
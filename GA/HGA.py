@@ -32,7 +32,7 @@ class HGA(GA):
             self.algconf.Pmut.cur = self.algconf.Pmut.max
             # if curr solution exists, save it as prev solution
             if self.currentSolution != None:
-                self.prevSolution = copy.deepcopy(self.currentSolution)
+                self.prevSolution = self.currentSolution.copy()
                 self.currentAvgC = reduce(lambda a, b: a + (b.relL + b.relR)/2, self.population, 0)/len(self.population)
                 self.prevAvgC = self.currentAvgC
         # else prevSollution != None
@@ -59,7 +59,7 @@ class HGA(GA):
                 elif avgCDiff <= -0.03:
                     self.algconf.mutPercent.cur = self.algconf.mutPercent.max
                     self.algconf.Pmut.cur = self.algconf.Pmut.max
-            self.prevSolution = copy.deepcopy(self.currentSolution)
+            self.prevSolution = self.currentSolution.copy()
             self.prevAvgC = self.currentAvgC
         # somehow prev != None, curr == None
         else:
@@ -40,7 +40,7 @@ class HGA_Moore(GA_Moore):
             self.algconf.Pmut.cur = self.algconf.Pmut.max
             # if curr solution exists, save it as prev solution
             if self.currentSolution != None:
-                self.prevSolution = copy.deepcopy(self.currentSolution)
+                self.prevSolution = self.currentSolution.copy()
                 self.currentAvgC = reduce(lambda a, b: a + (b.relL + b.relR) / 2, self.population, 0) / len(self.population)
                 self.currentAvgL = reduce(lambda a, b: a + b.relL, self.population, 0) / len(self.population)
                 self.currentAvgR = reduce(lambda a, b: a + b.relR, self.population, 0) / len(self.population)
@@ -77,7 +77,7 @@ class HGA_Moore(GA_Moore):
                 elif avgDiff <= -0.03:
                     self.algconf.mutPercent.cur = self.algconf.mutPercent.max
                     self.algconf.Pmut.cur = self.algconf.Pmut.max
-            self.prevSolution = copy.deepcopy(self.currentSolution)
+            self.prevSolution = self.currentSolution.copy()
             self.prevAvgC = self.currentAvgC
             self.prevAvgL = self.currentAvgL
             self.prevAvgR = self.currentAvgR
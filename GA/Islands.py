@@ -0,0 +1,181 @@
+from Common.Algorithm import Algorithm
+from Common.System import System
+from Common.Module import Module
+from Common.Statistics import Execution
+from Common.Population import encode, decodeModules
+from GA import interval_key_pessimistic_extended, sort_key_pessimistic_extended
+from GA_Moore import sort_key_moore
+from HGA import HGA
+from HGA_Moore import HGA_Moore
+import multiprocessing, random, time, sys
+
+class Migration:
+    '''
+    Exchange of individuals between islands.
+    Every algconf.migrationInterval generations the best algconf.migrants individuals
+    are sent to neighbour islands and received migrants replace the worst individuals.
+    Individuals are sent as gene lists (see Population.encode).
+    :param ins: list of connections to receive migrants from.
+    :param outs: list of connections to send migrants to.
+    '''
+    def __init__(self, ins, outs):
+        self.ins = list(ins)
+        self.outs = outs
+        self.sent = 0
+        self.received = 0
+
+    def __receive(self):
+        '''Takes all migrants which have already arrived (doesn't wait).'''
+        migrants = []
+        for c in self.ins[:]:
+            while c.poll():
+                genes = c.recv()
+                if genes == None:
+                    # neighbour has finished
+                    self.ins.remove(c)
+                    break
+                migrants.extend(genes)
+        return migrants
+
+    def Exchange(self, algorithm):
+        '''
+        Makes migration if it's time for it.
+        :param algorithm: algorithm of the island.
+        '''
+        if algorithm.currentIter % algorithm.algconf.migrationInterval != 0:
+            return
+        pop = algorithm.population
+        pop.sort(key=algorithm.key, reverse=True)
+        genes = [encode(s) for s in pop[:algorithm.algconf.migrants]]
+        for c in self.outs:
+            c.send(genes)
+        self.sent += len(genes) * len(self.outs)
+        migrants = self.__receive()[:len(pop) - algorithm.algconf.migrants]
+        for i in range(len(migrants)):
+            s = System()
+            s.modules = decodeModules(migrants[i])
+            s.Update()
+            pop[len(pop) - 1 - i] = s
+        self.received += len(migrants)
+        pop.sort(key=algorithm.key, reverse=True)
+
+    def Close(self):
+        '''
+        Tells neighbours that island has finished and waits until they finish too
+        (they may still send migrants, so pipes must be read).
+        '''
+        for c in self.outs:
+            c.send(None)
+        while self.ins:
+            if not self.__receive():
+                time.sleep(0.01)
+
+class HGAIsland(HGA):
+    '''HGA which exchanges individuals with other islands.'''
+    key = staticmethod(sort_key_pessimistic_extended)
+
+    def __init__(self, migration):
+        HGA.__init__(self)
+        self.migration = migration
+
+    def Step(self):
+        HGA.Step(self)
+        self.migration.Exchange(self)
+
+class HGA_MooreIsland(HGA_Moore):
+    '''HGA_Moore which exchanges individuals with other islands.'''
+    key = staticmethod(sort_key_moore)
+
+    def __init__(self, migration):
+        HGA_Moore.__init__(self)
+        self.migration = migration
+
+    def Step(self):
+        HGA_Moore.Step(self)
+        self.migration.Exchange(self)
+
+def _runIsland(cls, seed, conf, algconf, constraints, ins, outs, result):
+    '''Runs one island in separate process and sends its execution and migration counts to result.'''
+    Module.conf = conf
+    Algorithm.algconf = algconf
+    System.constraints = constraints
+    random.seed(seed)
+    if Algorithm.algconf.metamodel:
+        Algorithm.algconf.metamodel.Clear()
+    migration = Migration(ins, outs)
+    algorithm = cls(migration)
+    algorithm.Run()
+    migration.Close()
+    result.send((algorithm.stat.execs[-1], migration.sent, migration.received))
+
+class Islands(Algorithm):
+    '''
+    Island model of HGA: algconf.islands populations evolve in separate processes
+    and exchange their best individuals through pipes (see Migration).
+    With "ring" topology island i sends migrants to island i+1, with "full" one - to all islands.
+    Result is the best of the islands solutions.
+    '''
+    island = HGAIsland
+    multiprocess = True
+
+    def __init__(self):
+        Algorithm.__init__(self)
+        self.sent = 0
+        self.received = 0
+
+    def __targets(self, i):
+        n = self.algconf.islands
+        if n == 1:
+            return []
+        if self.algconf.topology == "full":
+            return [j for j in range(n) if j != i]
+        return [(i + 1) % n]
+
+    def Run(self):
+        self.Clear()
+        Algorithm.time = time.time()
+        n = self.algconf.islands
+        ins = [[] for i in range(n)]
+        outs = [[] for i in range(n)]
+        for i in range(n):
+            for j in self.__targets(i):
+                r, w = multiprocessing.Pipe(False)
+                outs[i].append(w)
+                ins[j].append(r)
+        processes = []
+        results = []
+        for i in range(n):
+            r, w = multiprocessing.Pipe(False)
+            seed = random.randint(0, sys.maxint)
+            p = multiprocessing.Process(target=_runIsland, args=(self.island, seed, Module.conf,
+                                        Algorithm.algconf, System.constraints, ins[i], outs[i], w))
+            p.start()
+            processes.append(p)
+            results.append(r)
+        execs = []
+        for r in results:
+            ex, sent, received = r.recv()
+            execs.append(ex)
+            self.sent += sent
+            self.received += received
+        for p in processes:
+            p.join()
+        best = max(execs, key=lambda e: interval_key_pessimistic_extended(e.solution))
+        self.currentSolution = best.solution
+        self.currentIter = max(e.iter for e in execs)
+        print "Best solution: ", self.currentSolution
+        print "Migrants sent: ", self.sent, " received: ", self.received
+        print "--------------------------------------\n"
+        Algorithm.time = time.time() - Algorithm.time
+        self.stat.AddExecution(Execution(self.currentSolution, self.currentIter, Algorithm.time,
+                                         sum(e.timecounts for e in execs), sum(e.simcounts for e in execs),
+                                         sum(e.simhits for e in execs), sum(e.fithits for e in execs)))
+
+    def Clear(self):
+        Algorithm.Clear(self)
+        self.sent = 0
+        self.received = 0
+
+class Islands_Moore(Islands):
+    '''Island model of HGA_Moore.'''
+    island = HGA_MooreIsland
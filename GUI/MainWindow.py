@@ -9,12 +9,17 @@ from Common.System import System
 from Common.Module import Module
 from Common.Algorithm import Algorithm
 from Common.AlgConfig import AlgConfig
+from Common.Parallel import runExecutions
 from GA.GA import GA
 from GA.HGA import HGA
 from GA.GA_optimistic import GA_optimistic
 from GA.GA_optimistic_left import GA_optimistic_left
 from GA.GA_Moore import GA_Moore
 from GA.HGA_Moore import HGA_Moore
+from GA.Islands import Islands, Islands_Moore
+from Exact.BranchAndBound import BranchAndBound
+from Exact.Exhaustive import Exhaustive
+from Exact.Knapsack import Knapsack
 import xml.dom.minidom, time, os
 
 class MainWindow(QMainWindow):
@@ -54,6 +59,8 @@ class MainWindow(QMainWindow):
                 self.ui.algorithm.currentIndex() == 2 or self.ui.algorithm.currentIndex()==3 or
                 self.ui.algorithm.currentIndex() == 4 or self.ui.algorithm.currentIndex() == 5):
             self.algconfig = GAConfig()
+        else:
+            self.algconfig = AlgConfig()
         self.algconfig.LoadFromXmlNode(root)
 
     def Run(self):
@@ -76,7 +83,10 @@ class MainWindow(QMainWindow):
         if algidx==0:
             algorithm = GA()
         elif algidx==1:
-            algorithm = HGA()
+            if Algorithm.algconf.islands > 1:
+                algorithm = Islands()
+            else:
+                algorithm = HGA()
         elif algidx==2:
             algorithm = GA_optimistic()
         elif algidx==3:
@@ -84,13 +94,19 @@ class MainWindow(QMainWindow):
         elif algidx==4:
             algorithm = GA_Moore()
         elif algidx==5:
-            algorithm = HGA_Moore()
+            if Algorithm.algconf.islands > 1:
+                algorithm = Islands_Moore()
+            else:
+                algorithm = HGA_Moore()
+        elif algidx==6:
+            algorithm = BranchAndBound()
+        elif algidx==7:
+            algorithm = Exhaustive()
+        elif algidx==8:
+            algorithm = Knapsack()
         Algorithm.result_filename = self.ui.result_filename.text()
-        for i in range(self.ui.execNum.value()):
-            if algorithm.algconf.metamodel:
-                algorithm.algconf.metamodel.Clear()
-            algorithm.Run()
-            self.best = algorithm.currentSolution
+        runExecutions(algorithm, self.ui.execNum.value())
+        self.best = algorithm.currentSolution
         algorithm.PrintStats()
         try:
             os.remove("sch" + str(os.getpid()) + ".xml")
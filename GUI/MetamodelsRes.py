@@ -48,7 +48,7 @@ class MetamodelsRes(QDialog):
             s = None
             if not self.random:
                 while not s or any(s1 == s for s1 in self.systems):
-                    s = copy.deepcopy(self.best)
+                    s = self.best.copy()
                     j = random.randint(0, len(s.modules)-1)
                     type = random.choice(Module.conf.modules[j].tools)
                     if type == "none":
@@ -43,6 +43,9 @@ class Ui_MainWindow(object):
         self.algorithm.addItem(_fromUtf8(""))
         self.algorithm.addItem(_fromUtf8(""))
         self.algorithm.addItem(_fromUtf8(""))
+        self.algorithm.addItem(_fromUtf8(""))
+        self.algorithm.addItem(_fromUtf8(""))
+        self.algorithm.addItem(_fromUtf8(""))
         self.verticalLayout.addWidget(self.algorithm)
         self.label_2 = QtGui.QLabel(self.centralwidget)
         self.label_2.setObjectName(_fromUtf8("label_2"))
@@ -263,6 +266,9 @@ class Ui_MainWindow(object):
         self.algorithm.setItemText(3, _translate("MainWindow", "GA Optimistic Left", None))
         self.algorithm.setItemText(4, _translate("MainWindow", "GA Moore", None))
         self.algorithm.setItemText(5, _translate("MainWindow", "HGA Moore", None))
+        self.algorithm.setItemText(6, _translate("MainWindow", "Branch and Bound", None))
+        self.algorithm.setItemText(7, _translate("MainWindow", "Exhaustive Search", None))
+        self.algorithm.setItemText(8, _translate("MainWindow", "Knapsack (cost constraint only)", None))
         self.label_2.setText(_translate("MainWindow", "Number of executions:", None))
         #self.label_4.setText(_translate("MainWindow", "Check Time:", None))
         #self.checktime_yes.setText(_translate("MainWindow", "Yes", None))
@@ -0,0 +1,151 @@
+from Metamodels.Metamodel import Metamodel
+import heapq, math
+
+class KDNode:
+    def __init__(self, point, value, axis, index):
+        self.point = point
+        self.values = [value]
+        self.axis = axis
+        self.index = index
+        self.left = None
+        self.right = None
+
+class KDTree:
+    '''
+    KD-tree of points with values. Every point is kept once with the list of its values.
+    Points are inserted one by one without balancing, so the tree may degrade.
+    Rebuild makes it balanced again. Search of nearest points is O(log n) for balanced tree.
+    :param dim: dimension of points.
+    '''
+    def __init__(self, dim):
+        self.dim = dim
+        self.root = None
+        #number of points and number of values
+        self.size = 0
+        self.count = 0
+
+    def insert(self, point, value):
+        '''Adds point with value.'''
+        self.count += 1
+        node = KDNode(point, value, 0, self.size)
+        if self.root == None:
+            self.root = node
+            self.size += 1
+            return
+        cur = self.root
+        while True:
+            if point == cur.point:
+                cur.values.append(value)
+                return
+            if point[cur.axis] < cur.point[cur.axis]:
+                if cur.left == None:
+                    cur.left = node
+                    break
+                cur = cur.left
+            else:
+                if cur.right == None:
+                    cur.right = node
+                    break
+                cur = cur.right
+        node.axis = (cur.axis + 1) % self.dim
+        self.size += 1
+
+    def __nodes(self, node, res):
+        if node != None:
+            res.append(node)
+            self.__nodes(node.left, res)
+            self.__nodes(node.right, res)
+
+    def __build(self, nodes, depth):
+        if nodes == []:
+            return None
+        axis = depth % self.dim
+        nodes.sort(key=lambda n: n.point[axis])
+        mid = len(nodes) / 2
+        # equal coordinates must go to the right subtree (see insert)
+        while mid > 0 and nodes[mid - 1].point[axis] == nodes[mid].point[axis]:
+            mid -= 1
+        node = nodes[mid]
+        node.axis = axis
+        node.left = self.__build(nodes[:mid], depth + 1)
+        node.right = self.__build(nodes[mid + 1:], depth + 1)
+        return node
+
+    def Rebuild(self):
+        '''Makes tree balanced.'''
+        nodes = []
+        self.__nodes(self.root, nodes)
+        self.root = self.__build(nodes, 0)
+
+    def __search(self, node, point, k, heap):
+        if node == None:
+            return
+        d = 0
+        for a, b in zip(point, node.point):
+            d += (a - b) * (a - b)
+        if len(heap) < k:
+            heapq.heappush(heap, (-d, node.index, node.values))
+        elif d < -heap[0][0]:
+            heapq.heapreplace(heap, (-d, node.index, node.values))
+        diff = point[node.axis] - node.point[node.axis]
+        if diff < 0:
+            near, far = node.left, node.right
+        else:
+            near, far = node.right, node.left
+        self.__search(near, point, k, heap)
+        if len(heap) < k or diff * diff < -heap[0][0]:
+            self.__search(far, point, k, heap)
+
+    def nearest(self, point, k):
+        '''
+        :returns: list of pairs (squared distance, list of values) for k nearest points sorted by distance.
+        '''
+        heap = []
+        self.__search(self.root, point, k, heap)
+        return [(-d, v) for d, i, v in sorted(heap, reverse=True)]
+
+class KNearestNeighbours(Metamodel):
+    '''
+    Metamodel which estimates module time as the average time of simulated systems
+    with k nearest features of the module (see Metamodel.features). If there are simulated systems
+    with the same features, only their average time is taken.
+    Deviation of estimate is the standard deviation of times of all k nearest features.
+    Every module has its own KD-tree: systems are inserted at once, trees are balanced in Update.
+    :param k: number of neighbours.
+    '''
+    def __init__(self, k):
+        Metamodel.__init__(self)
+        self.k = k
+        self.trees = {}
+
+    def estimate(self, system):
+        res = []
+        features = self.features(system)
+        for num in range(len(system.modules)):
+            tree = self.trees.get(num)
+            if tree == None or tree.count < self.k:
+                return None
+            neighbours = tree.nearest(features[num], self.k)
+            values = [v for d, l in neighbours for v in l]
+            mean = float(sum(values)) / len(values)
+            deviation = math.sqrt(sum((v - mean) ** 2 for v in values) / len(values))
+            if neighbours[0][0] == 0:
+                mean = float(sum(neighbours[0][1])) / len(neighbours[0][1])
+            res.append((int(round(mean)), deviation))
+        return res
+
+    def add(self, system):
+        features = self.features(system)
+        for m in system.modules:
+            tree = self.trees.get(m.num)
+            if tree == None:
+                tree = KDTree(len(features[m.num]))
+                self.trees[m.num] = tree
+            tree.insert(features[m.num], m.time)
+
+    def Update(self):
+        for tree in self.trees.values():
+            tree.Rebuild()
+
+    def Clear(self):
+        self.trees = {}
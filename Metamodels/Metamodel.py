@@ -0,0 +1,70 @@
+from Common.Module import Module
+
+class Metamodel:
+    '''
+    Base class for metamodels of module times.
+    Metamodel is trained on simulated systems and estimates times of other systems
+    without simulation (see System.__computeTime).
+    '''
+    def __init__(self):
+        pass
+
+    def features(self, system):
+        '''
+        Makes feature vectors for times of modules. Features of module are:
+        its execution time, the longest path of execution and transfer times of previous modules
+        (start time by critical path, see System.getTimesCPath) and total execution time
+        of all its previous modules (ModConfig.dep).
+        :param system: object of class 'System'.
+        :returns: list of feature vectors of modules.
+        '''
+        finish = [0] * len(system.modules)
+        res = [None] * len(system.modules)
+        for num in Module.conf.order:
+            conf = Module.conf.modules[num]
+            start = 0
+            for m in conf.src:
+                if finish[m.num] > start:
+                    start = finish[m.num]
+            execTime = system.modules[num].execTime
+            finish[num] = start + execTime + conf.output
+            res[num] = [execTime, start, sum(system.modules[m.num].execTime for m in conf.dep)]
+        return res
+
+    def estimate(self, system):
+        '''
+        Estimates module times of system.
+        Should be reimplemented in subclass.
+        :param system: object of class 'System'.
+        :returns: list of pairs (time, standard deviation of time) for modules,
+        None if times can't be estimated (system must be simulated then).
+        '''
+        return None
+
+    def getTime(self, system):
+        '''
+        Estimates module times of system and sets them (see System.setEstimatedTimes).
+        :param system: object of class 'System'.
+        :returns: False if times can't be estimated.
+        '''
+        estimate = self.estimate(system)
+        if estimate == None:
+            return False
+        system.setEstimatedTimes([t for t, d in estimate])
+        return True
+
+    def add(self, system):
+        '''
+        Adds simulated system to training data.
+        Should be reimplemented in subclass.
+        :param system: object of class 'System' with simulated times.
+        '''
+        pass
+
+    def Update(self):
+        '''Updates model after adding of simulated systems. It's called after every GA step.'''
+        pass
+
+    def Clear(self):
+        '''Removes all training data (it's called before every run).'''
+        pass
@@ -0,0 +1,87 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+from Metamodels.Metamodel import Metamodel
+import math
+
+class Polynomial(Metamodel):
+    '''
+    Metamodel which estimates time of every module by polynomial of execution times of the module
+    and its previous modules (ModConfig.dep). Terms are 1 and powers of every execution time
+    up to degree (products of different times aren't used).
+    Coefficients are fitted by recursive least squares: systems added by add are taken into account
+    in Update by rank-one updates of the inverse covariance matrix, so Update costs O(terms^2)
+    for every new system instead of fitting on all simulated systems.
+    Times are estimated only when every module model has got at least as many systems as terms.
+    Deviation of estimate is computed from the variance of prediction errors of the model
+    on new systems (before they were taken into account).
+    Requires numpy.
+    :param conf: object of class 'SysConfig'.
+    :param degree: degree of polynomial.
+    :param forgetting: forgetting factor of old systems (1.0 - they aren't forgotten).
+    '''
+    def __init__(self, conf, degree=2, forgetting=1.0):
+        if numpy == None:
+            raise ImportError("Polynomial metamodel requires numpy")
+        Metamodel.__init__(self)
+        self.degree = degree
+        self.forgetting = forgetting
+        self.inputs = [[c.num] + sorted(m.num for m in c.dep) for c in conf.modules]
+        # times are scaled for numerical stability
+        self.scale = float(max(c.timeInterval()[1] for c in conf.modules))
+        self.Clear()
+
+    def __terms(self, system, num):
+        x = numpy.array([system.modules[i].execTime for i in self.inputs[num]]) / self.scale
+        return numpy.concatenate([[1.0]] + [x ** d for d in range(1, self.degree + 1)])
+
+    def estimate(self, system):
+        res = []
+        for num in range(len(system.modules)):
+            if self.count[num] < len(self.theta[num]) or self.errors[num] == 0:
+                return None
+            x = self.__terms(system, num)
+            time = self.theta[num].dot(x) * self.scale
+            variance = self.sse[num] / self.errors[num] * (1 + x.dot(self.P[num]).dot(x))
+            res.append((max(0, int(round(time))), math.sqrt(variance) * self.scale))
+        return res
+
+    def add(self, system):
+        self.pending.append([(self.__terms(system, m.num), m.time / self.scale) for m in system.modules])
+
+    def Update(self):
+        for sample in self.pending:
+            for num in range(len(sample)):
+                x, y = sample[num]
+                P = self.P[num]
+                Px = P.dot(x)
+                gain = Px / (self.forgetting + x.dot(Px))
+                error = y - self.theta[num].dot(x)
+                if self.count[num] >= len(x):
+                    # error of prediction (model is already defined)
+                    self.sse[num] += error * error / (1 + x.dot(Px))
+                    self.errors[num] += 1
+                self.theta[num] += gain * error
+                P = (P - numpy.outer(gain, Px)) / self.forgetting
+                # keep matrix symmetric in spite of rounding errors
+                self.P[num] = (P + P.T) / 2
+                self.count[num] += 1
+        self.pending = []
+
+    def Clear(self):
+        self.theta = []
+        self.P = []
+        self.count = []
+        #sum of squared prediction errors and their number
+        self.sse = []
+        self.errors = []
+        for inputs in self.inputs:
+            n = 1 + self.degree * len(inputs)
+            self.theta.append(numpy.zeros(n))
+            self.P.append(numpy.eye(n) * 1e4)
+            self.count.append(0)
+            self.sse.append(0.0)
+            self.errors.append(0)
+        #added systems which aren't taken into account yet
+        self.pending = []
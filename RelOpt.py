@@ -1,76 +1,62 @@
-import sys, xml.dom.minidom
-from GUI.MainWindow import MainWindow
-from PyQt4 import QtGui
-
-from Common.SysConfig import SysConfig
-from GA.GAConfig import GAConfig
-from Common.Constraints import CostConstraints, TimeConstraints
-from Common.System import System
-from Common.Module import Module
+import sys, os
 from Common.Algorithm import Algorithm
-from Common.AlgConfig import AlgConfig
+from Common.Parallel import runExecutions
+from Common.Batch import Sweep, runSweep, makeMetamodel, loadSystem, loadAlgConfig, algorithms
 from GA.HGA import HGA
-from GA.HGA_Moore import HGA_Moore
+from GA.Islands import Islands
 
 def Console(argv):
-    print "Warning: Do not use command-line interface!"
+    print "Warning: Do not use command-line interface! Use batch mode for experiments: RelOpt.py batch sweep.xml"
     _algconf = argv[1]
     _sysconf = argv[2]
     _num = argv[3]
     _metamodel = argv[4]
     _percent = argv[5]
 
-    f = open(_algconf, "r")
-    dom = xml.dom.minidom.parse(f)
-    root = dom.childNodes[0]
-    Algorithm.algconf = GAConfig()
-    Algorithm.algconf.LoadFromXmlNode(root)
-    f.close()
-
-    Module.conf = SysConfig()
-    Module.conf.loadXML(_sysconf)
-    System.constraints = []
-    if Module.conf.limitcost != None:
-        System.constraints.append(CostConstraints(Module.conf.limitcost))
-    c = Module.conf.getLimitTimes()
-    if c != None:
-        System.constraints.append(TimeConstraints(c))
+    loadAlgConfig(_algconf)
+    loadSystem(_sysconf)
 
     result = _sysconf.replace(".xml", "")
 
     result += "_"+_metamodel
-    Algorithm.algconf.use_metamodel = True
-    if _metamodel=="none":
-        Algorithm.algconf.use_metamodel = False
-    elif _metamodel=="kn":
-        Algorithm.algconf.metamodel = KNearestNeighbours(10)
-    elif _metamodel=="lr":
-        Algorithm.algconf.metamodel = Polynomial(Module.conf)
-    elif _metamodel=="rnd":
-        Algorithm.algconf.metamodel = Random()
-    elif _metamodel=="avg":
-        Algorithm.algconf.metamodel = Averaging()
+    Algorithm.algconf.metamodel = makeMetamodel(_metamodel)
+    Algorithm.algconf.use_metamodel = Algorithm.algconf.metamodel != None
 
     Algorithm.algconf.pop_control_percent = float(_percent)/100.0
 
-    algorithm = HGA()
+    if len(argv) > 6:
+        if argv[6] not in algorithms:
+            print "Unknown algorithm", argv[6] + ", available:", ", ".join(sorted(algorithms))
+            return
+        algorithm = algorithms[argv[6]]()
+        result += "_" + argv[6]
+    elif Algorithm.algconf.islands > 1:
+        algorithm = Islands()
+    else:
+        algorithm = HGA()
     Algorithm.result_filename  = result + "_" +_percent + ".csv"
 
-    for i in range(int(_num)):
-        if algorithm.algconf.metamodel:
-            algorithm.algconf.metamodel.Clear()
-        algorithm.Run()
-        algorithm.PrintStats()
+    runExecutions(algorithm, int(_num), lambda a: a.PrintStats())
     try:
         os.remove("sch" + str(os.getpid()) + ".xml")
         os.remove("res" + str(os.getpid()) + ".xml")
     except:
         pass
 
+def Batch(argv):
+    '''Runs sweep of experiments without GUI (see Common.Batch).'''
+    sweep = Sweep()
+    sweep.loadXML(argv[2])
+    runSweep(sweep)
+
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
+    if len(sys.argv) > 2 and sys.argv[1] == "batch":
+        Batch(sys.argv)
+    elif len(sys.argv) > 1:
         Console(sys.argv)
     else:
+        from GUI.MainWindow import MainWindow
+        from PyQt4 import QtGui
         app = QtGui.QApplication(sys.argv)
         window = MainWindow()
         window.show()
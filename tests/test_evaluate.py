@@ -0,0 +1,85 @@
+'''Evaluation stage (System.Evaluate) must give the same values as System.Update and evaluate
+every changed system once. Run from the root of repository:
+python -m unittest discover tests
+'''
+import os, sys, random, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Common.SysConfig import SysConfig
+from Common.System import System
+from Common.Module import Module, tools
+from Common.Constraints import CostConstraints, TimeConstraints
+from Common.Algorithm import Algorithm
+from GA.GAConfig import GAConfig
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "example.xml")
+
+def randomModule(num, rnd):
+    conf = Module.conf.modules[num]
+    tool = rnd.choice(conf.tools)
+    hw, sw = rnd.choice(conf.GetConfigs(tool))
+    return tools[tool](num, hw, sw)
+
+def values(s):
+    return s.relL, s.relR, s.cost, [m.time for m in s.modules], s.penalty
+
+class EvaluateTest(unittest.TestCase):
+    def setUp(self):
+        self.saved = (getattr(Module, "conf", None), Algorithm.algconf, System.constraints)
+        Algorithm.algconf = GAConfig()
+        Algorithm.algconf.time_method = "sim"
+        Module.conf = SysConfig()
+        Module.conf.loadXML(EXAMPLE)
+        limits = [l / 2 for l in Module.conf.getLimitTimes()]
+        System.constraints = [CostConstraints(Module.conf.limitcost / 2), TimeConstraints(limits)]
+        self.rnd = random.Random(3)
+
+    def tearDown(self):
+        Module.conf, Algorithm.algconf, System.constraints = self.saved
+
+    def population(self, n):
+        res = []
+        for i in range(n):
+            s = System()
+            s.hwrc_cost = Module.conf.hwrc_cost
+            s.modules = [randomModule(num, self.rnd) for num in range(Module.conf.modNum)]
+            s.Update(use_metamodel=False)
+            res.append(s)
+        return res
+
+    def test_same_values(self):
+        for cache in (True, False):
+            population = self.population(100)
+            for step in range(5):
+                if not cache:
+                    Algorithm.algconf.fitcache.Clear()
+                for s in self.rnd.sample(population, 60):
+                    for j in range(self.rnd.randint(1, 3)):
+                        num = self.rnd.randint(0, Module.conf.modNum - 1)
+                        s.replaceModule(num, randomModule(num, self.rnd), update=False)
+                # upper bound of penalty is used until times are evaluated
+                bounds = dict((id(s), s.penalty) for s in population if s.dirty)
+                System.Evaluate(population + population[:10])
+                for s in population:
+                    self.assertFalse(s.dirty)
+                    self.assertTrue(s.penalty <= bounds.get(id(s), s.penalty))
+                    c = System()
+                    c.hwrc_cost = s.hwrc_cost
+                    c.modules = list(s.modules)
+                    c.Update(use_metamodel=False)
+                    self.assertEqual(values(s), values(c))
+            self.assertTrue(any(s.penalty < 1 for s in population))
+
+    def test_evaluated_once(self):
+        population = self.population(50)
+        changed = self.rnd.sample(population, 20)
+        for s in changed:
+            num = self.rnd.randint(0, Module.conf.modNum - 1)
+            s.replaceModule(num, randomModule(num, self.rnd), update=False)
+        counts = Algorithm.timecounts
+        System.Evaluate(population + changed)
+        self.assertEqual(Algorithm.timecounts - counts, len(changed))
+        System.Evaluate(population)
+        self.assertEqual(Algorithm.timecounts - counts, len(changed))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+'''Exact solvers must find the same solution as brute force over all configurations
+evaluated by simulation (time_method = "sim"). Run from the root of repository:
+python -m unittest discover tests
+'''
+import os, sys, random, itertools, tempfile, unittest
+import numpy
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Common.SysConfig import SysConfig
+from Common.Constraints import CostConstraints, TimeConstraints
+from Common.System import System
+from Common.Module import Module, tools
+from Common.Algorithm import Algorithm
+from GA.GAConfig import GAConfig
+from Exact.BranchAndBound import BranchAndBound
+from Exact.Knapsack import Knapsack
+from Exact.Exhaustive import Exhaustive, extremeIndices
+from GA.GA_Moore import moore_distance
+
+TOOLS = ["none", "nvp01", "rb11"]
+
+def systemXML(n, rnd, limits=None, tools=TOOLS):
+    '''Random system of n modules with 3 sw and 2 hw versions, modules are linked with probability 0.7.
+    All modules are in the same reconfiguration zone.'''
+    out = ['<system limitcost="10000" costhwrc="50" qhwrcL="0.99" qhwrcR="0.999">']
+    for i in range(n):
+        limit = ""
+        if limits != None:
+            limit = ' limittime="%d"' % limits[i]
+        out.append('<module%s num="%d" qallL="0.99" qdL="0.99" qrvL="0.99" qallR="0.997" qdR="0.998" qrvR="0.998" '
+                   'hwrczonenum="0" tvote="%d" ttest="%d" trecov="%d">'
+                   % (limit, i, rnd.randint(0, 2), rnd.randint(0, 2), rnd.randint(0, 2)))
+        for t in tools:
+            out.append('<tool name="%s"/>' % t)
+        for j in range(3):
+            l = rnd.uniform(0.85, 0.97)
+            out.append('<sw cost="%d" num="%d" relL="%.3f" relR="%.3f"/>'
+                       % (rnd.randint(5, 30), j, l, min(0.999, l + rnd.uniform(0, 0.02))))
+        for j in range(2):
+            l = rnd.uniform(0.95, 0.99)
+            out.append('<hw cost="%d" num="%d" relL="%.3f" relR="%.3f"/>'
+                       % (rnd.randint(5, 30), j, l, min(0.999, l + rnd.uniform(0, 0.01))))
+        for s in range(3):
+            for h in range(2):
+                out.append('<time swnum="%d" hwnum="%d" t="%d"/>' % (s, h, rnd.randint(1, 10)))
+        out.append('</module>')
+    for i in range(n):
+        for j in range(i + 1, n):
+            if rnd.random() < 0.7:
+                out.append('<link src="%d" dst="%d" vol="%d"/>' % (i, j, rnd.randint(1, 5)))
+    out.append('</system>')
+    return "\n".join(out)
+
+def load(xml):
+    '''
+    Loads system configuration and constraints to Module.conf and System.constraints.
+    Caches are kept by chromosome, so they are cleared for the new system.
+    '''
+    Algorithm.algconf.simcache.Clear()
+    Algorithm.algconf.fitcache.Clear()
+    f, filename = tempfile.mkstemp(".xml")
+    os.write(f, xml)
+    os.close(f)
+    try:
+        Module.conf = SysConfig()
+        Module.conf.loadXML(filename)
+    finally:
+        os.remove(filename)
+    System.constraints = [CostConstraints(Module.conf.limitcost)]
+    if Module.conf.getLimitTimes() != None:
+        System.constraints.append(TimeConstraints(Module.conf.getLimitTimes()))
+
+def configurations():
+    ''':returns: list of all modules for every module of Module.conf.'''
+    res = []
+    for conf in Module.conf.modules:
+        modules = []
+        for tool in conf.tools:
+            modules += [tools[tool](conf.num, hw, sw) for hw, sw in conf.GetConfigs(tool)]
+        res.append(modules)
+    return res
+
+def key(s):
+    return (s.relL + s.relR) / 2, s.relL - s.relR
+
+def bruteForce():
+    ''':returns: key of the best system satisfying constraints or None.'''
+    best = None
+    for modules in itertools.product(*configurations()):
+        s = System()
+        s.modules = list(modules)
+        s.hwrc_cost = Module.conf.hwrc_cost
+        s.Update(use_metamodel=False)
+        if s.CheckConstraints() and (best == None or key(s) > best):
+            best = key(s)
+    return best
+
+def timedSystem(seed, tools=TOOLS):
+    '''
+    Loads random system of 3 modules with deadlines near simulated times of its random solution,
+    so constraints are tight, but some solution satisfies them.
+    '''
+    rnd = random.Random(seed)
+    load(systemXML(3, random.Random(seed), None, tools))
+    s = System()
+    s.modules = [rnd.choice(modules) for modules in configurations()]
+    s.hwrc_cost = Module.conf.hwrc_cost
+    s.Update(use_metamodel=False)
+    s.getTimesSim()
+    load(systemXML(3, random.Random(seed), [m.time + rnd.randint(0, 3) for m in s.modules], tools))
+
+class ExactTest(unittest.TestCase):
+    def setUp(self):
+        self.saved = (getattr(Module, "conf", None), Algorithm.algconf, System.constraints)
+        Algorithm.algconf = GAConfig()
+        Algorithm.algconf.time_method = "sim"
+        self.stdout = sys.stdout
+        sys.stdout = open(os.devnull, "w")
+
+    def tearDown(self):
+        sys.stdout.close()
+        sys.stdout = self.stdout
+        Module.conf, Algorithm.algconf, System.constraints = self.saved
+
+    def run_algorithm(self, cls):
+        a = cls()
+        a.Run()
+        if a.currentSolution == None:
+            return None
+        return key(a.currentSolution)
+
+    def test_branch_and_bound_time_constraints(self):
+        for seed in range(6):
+            timedSystem(seed)
+            self.assertEqual(self.run_algorithm(BranchAndBound), bruteForce(), "seed %d" % seed)
+
+    def test_knapsack(self):
+        for seed in range(6):
+            rnd = random.Random(seed)
+            load(systemXML(3, rnd))
+            costs = sorted(sum(m.cost for m in modules) for modules in itertools.product(*configurations()))
+            # cost limit is between the cheapest and the most expensive system, so it's active
+            System.constraints = [CostConstraints(costs[rnd.randint(1, len(costs) - 1)])]
+            self.assertEqual(self.run_algorithm(Knapsack), bruteForce(), "seed %d" % seed)
+
+    def test_exhaustive_time_constraints(self):
+        for seed in range(6):
+            timedSystem(seed)
+            best = bruteForce()
+            # all combinations are kept and evaluated exactly
+            Algorithm.algconf.top_num = 10 ** 6
+            self.assertEqual(self.run_algorithm(Exhaustive), best, "seed %d" % seed)
+            Algorithm.algconf.top_num = 10
+            a = Exhaustive()
+            a.Run()
+            if a.exact:
+                self.assertEqual(key(a.currentSolution), best, "seed %d" % seed)
+
+    def test_exhaustive_hwrc(self):
+        for seed in range(3):
+            timedSystem(seed, ["none", "rb11", "hwrc20"])
+            Algorithm.algconf.top_num = 10 ** 6
+            self.assertEqual(self.run_algorithm(Exhaustive), bruteForce(), "seed %d" % seed)
+
+    def test_moore_extremes(self):
+        # the farthest intervals from any point are among kept ones
+        rnd = random.Random(0)
+        k = 3
+        for i in range(50):
+            L = numpy.array([rnd.random() for j in range(100)])
+            R = L + numpy.array([rnd.random() for j in range(100)])
+            kept = extremeIndices(L, R, k)
+            self.assertTrue(len(kept) <= 4 * k)
+            for j in range(20):
+                cL = rnd.uniform(0, 1)
+                cR = cL + rnd.uniform(0, 1)
+                dist = lambda sel: sorted(numpy.maximum(abs(L[sel] - cL), abs(R[sel] - cR)))[-k:]
+                self.assertEqual(dist(kept), dist(numpy.arange(100)))
+
+    def test_exhaustive_moore_front(self):
+        # without time constraints estimates are exact, kept part of the front gives the same Moore list
+        for seed in [0, 2, 4]:
+            load(systemXML(3, random.Random(seed), None, ["none", "nvp01", "rb11", "hwrc20"]))
+            System.constraints = [CostConstraints(150)]
+            Algorithm.algconf.top_num = 10 ** 6
+            a = Exhaustive()
+            a.Run()
+            Algorithm.algconf.top_num = 1
+            b = Exhaustive()
+            b.Run()
+            self.assertEqual(key(b.currentSolution), key(a.currentSolution))
+            self.assertEqual(len(b.top["moore"]), 1)
+            self.assertEqual(moore_distance(b.top["moore"][0], b.currentSolution),
+                             moore_distance(a.top["moore"][0], a.currentSolution))
+
+if __name__ == "__main__":
+    unittest.main()
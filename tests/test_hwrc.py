@@ -0,0 +1,108 @@
+'''Reliability of HWRC20 modules must depend only on modules of the system (its reconfiguration zones),
+not on modules created before. Run from the root of repository:
+python -m unittest discover tests
+'''
+import os, sys, random, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Common.SysConfig import SysConfig
+from Common.System import System
+from Common.Module import Module, HWRC20, tools
+from Common.Algorithm import Algorithm
+from GA.GAConfig import GAConfig
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "example.xml")
+
+def zoneRel(system, m):
+    '''Reliability of HWRC20 module m of system computed by definition: after self fault
+    other HWRC20 modules of its zone partake in reconfiguration, after their fault the rest of them.'''
+    conf = Module.conf
+    PhwrcL = 1 - conf.hwrc_relR
+    PhwrcR = 1 - conf.hwrc_relL
+    zone = [x for x in system.modules if isinstance(x, HWRC20) and x.num != m.num and
+            conf.modules[x.num].hwrc_zone_num == conf.modules[m.num].hwrc_zone_num]
+    P1L = P1R = 1.0
+    if zone != []:
+        P1L = P1R = 0.0
+        for j in zone:
+            rest = [conf.modules[x.num].hw[0] for x in zone if x.num != j.num]
+            P2L = P2R = 1.0
+            if rest != []:
+                P2L = sum(1 - hw.relR for hw in rest) / len(rest)
+                P2R = sum(1 - hw.relL for hw in rest) / len(rest)
+            hw = conf.modules[j.num].hw[0]
+            P1L += (1 - hw.relR) * (PhwrcL + conf.hwrc_relL * P2L)
+            P1R += (1 - hw.relL) * (PhwrcR + conf.hwrc_relR * P2R)
+        P1L /= len(zone)
+        P1R /= len(zone)
+    hw = conf.modules[m.num].hw[0]
+    sw = conf.modules[m.num].sw[0]
+    PL = (1 - hw.relR) * (PhwrcL + conf.hwrc_relL * P1L)
+    PR = (1 - hw.relL) * (PhwrcR + conf.hwrc_relR * P1R)
+    return (1 - PR) * sw.relL, (1 - PL) * sw.relR
+
+def randomModule(num, rnd, hwrc):
+    conf = Module.conf.modules[num]
+    tool = "hwrc20" if hwrc and "hwrc20" in conf.tools else rnd.choice(conf.tools)
+    hw, sw = rnd.choice(conf.GetConfigs(tool))
+    return tools[tool](num, hw, sw)
+
+def randomSystem(rnd):
+    s = System()
+    s.hwrc_cost = Module.conf.hwrc_cost
+    s.modules = [randomModule(num, rnd, rnd.random() < 0.6) for num in range(Module.conf.modNum)]
+    return s
+
+class HwrcTest(unittest.TestCase):
+    def setUp(self):
+        self.saved = (getattr(Module, "conf", None), Algorithm.algconf, System.constraints)
+        Algorithm.algconf = GAConfig()
+        Module.conf = SysConfig()
+        Module.conf.loadXML(EXAMPLE)
+        System.constraints = []
+        self.rnd = random.Random(1)
+
+    def tearDown(self):
+        Module.conf, Algorithm.algconf, System.constraints = self.saved
+
+    def check(self, s):
+        relL = relR = 1.0
+        for m in s.modules:
+            if isinstance(m, HWRC20):
+                L, R = zoneRel(s, m)
+                self.assertAlmostEqual(m.relL, L, 12)
+                self.assertAlmostEqual(m.relR, R, 12)
+            relL *= m.relL
+            relR *= m.relR
+        self.assertAlmostEqual(s.relL, relL, 12)
+        self.assertAlmostEqual(s.relR, relR, 12)
+
+    def test_reliability(self):
+        for i in range(200):
+            s = randomSystem(self.rnd)
+            s.Update(use_metamodel=False)
+            self.check(s)
+
+    def test_other_modules(self):
+        for i in range(50):
+            s = randomSystem(self.rnd)
+            s.Update(use_metamodel=False)
+            # modules created for other systems don't change reliability of the system
+            other = randomSystem(self.rnd)
+            other.Update(use_metamodel=False)
+            for num in range(Module.conf.modNum):
+                randomModule(num, self.rnd, True)
+            c = s.copy()
+            c.Update(use_metamodel=False)
+            self.assertEqual((c.relL, c.relR), (s.relL, s.relR))
+            self.check(s)
+
+    def test_replace_module(self):
+        s = randomSystem(self.rnd)
+        s.Update(use_metamodel=False)
+        for i in range(300):
+            num = self.rnd.randint(0, Module.conf.modNum - 1)
+            s.replaceModule(num, randomModule(num, self.rnd, self.rnd.random() < 0.5))
+            self.check(s)
+
+if __name__ == "__main__":
+    unittest.main()
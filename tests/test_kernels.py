@@ -0,0 +1,63 @@
+'''Vectorized reliability, cost and execution time of configurations (Common.Kernels) must be equal
+to ones computed by module classes. Run from the root of repository:
+python -m unittest discover tests
+'''
+import os, sys, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Common.SysConfig import SysConfig
+from Common.Module import Module, tools
+from Common import Kernels
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "example.xml")
+TOOLS = ["none", "nvp01", "nvp11", "rb11"]
+
+@unittest.skipUnless(Kernels.available(), "numpy isn't installed")
+class KernelsTest(unittest.TestCase):
+    def setUp(self):
+        self.saved = getattr(Module, "conf", None)
+        Module.conf = SysConfig()
+        Module.conf.loadXML(EXAMPLE)
+
+    def tearDown(self):
+        Module.conf = self.saved
+
+    def test_every_configuration(self):
+        for conf in Module.conf.modules:
+            for tool in TOOLS:
+                configs = conf.GetConfigs(tool)
+                hw, sw = Kernels.configArrays(conf, tool)
+                relL, relR = Kernels.computeRel(conf, tool, hw, sw)
+                cost = Kernels.computeCost(conf, tool, hw, sw)
+                execTime = Kernels.computeExecTime(conf, tool, hw, sw)
+                self.assertEqual(len(relL), len(configs))
+                for i, (h, s) in enumerate(configs):
+                    m = tools[tool](conf.num, h, s)
+                    self.assertEqual((hw[i].tolist(), sw[i].tolist()), (h, s))
+                    msg = "module %d, %s %s %s" % (conf.num, tool, h, s)
+                    self.assertAlmostEqual(relL[i], m.relL, 12, msg)
+                    self.assertAlmostEqual(relR[i], m.relR, 12, msg)
+                    self.assertEqual(cost[i], m.cost, msg)
+                    self.assertEqual(execTime[i], m.execTime, msg)
+
+    def test_config_table(self):
+        for conf in Module.conf.modules:
+            t = Kernels.configTable(conf)
+            self.assertTrue(Kernels.configTable(conf) is t)
+            used = [tool for tool in conf.tools if tool != "hwrc20"]
+            self.assertEqual(len(t), sum(len(conf.GetConfigs(tool)) for tool in used))
+            for i in range(len(t)):
+                m = t.module(i)
+                self.assertEqual(t.find(m), i)
+                self.assertEqual((t.relL[i], t.relR[i], t.cost[i], t.execTime[i]),
+                                 (m.relL, m.relR, m.cost, m.execTime))
+            if "hwrc20" in conf.tools:
+                hw, sw = conf.GetConfigs("hwrc20")[0]
+                self.assertEqual(t.find(tools["hwrc20"](conf.num, hw, sw)), -1)
+
+    def test_hwrc20(self):
+        conf = Module.conf.modules[0]
+        hw, sw = Kernels.configArrays(conf, "hwrc20")
+        self.assertRaises(ValueError, Kernels.computeRel, conf, "hwrc20", hw, sw)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+'''Systems stored in Population must have the same reliability, cost and penalty as ones computed by System.
+Run from the root of repository:
+python -m unittest discover tests
+'''
+import os, sys, random, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Common.SysConfig import SysConfig
+from Common.System import System
+from Common.Module import Module, tools
+from Common.Constraints import CostConstraints, TimeConstraints
+from Common.Algorithm import Algorithm
+from Common.Population import Population, encode, decodeModules
+from Common import Kernels
+from GA.GAConfig import GAConfig
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "example.xml")
+
+def randomSystem(rnd):
+    s = System()
+    s.hwrc_cost = Module.conf.hwrc_cost
+    for conf in Module.conf.modules:
+        tool = rnd.choice(conf.tools)
+        hw, sw = rnd.choice(conf.GetConfigs(tool))
+        s.modules.append(tools[tool](conf.num, hw, sw))
+    return s
+
+@unittest.skipUnless(Kernels.available(), "numpy isn't installed")
+class PopulationTest(unittest.TestCase):
+    def setUp(self):
+        self.saved = (getattr(Module, "conf", None), Algorithm.algconf, System.constraints)
+        Algorithm.algconf = GAConfig()
+        Algorithm.algconf.time_method = "sim"
+        Module.conf = SysConfig()
+        Module.conf.loadXML(EXAMPLE)
+        self.rnd = random.Random(2)
+
+    def tearDown(self):
+        Module.conf, Algorithm.algconf, System.constraints = self.saved
+
+    def test_columns(self):
+        systems = [randomSystem(self.rnd) for i in range(200)]
+        System.constraints = [TimeConstraints(Module.conf.getLimitTimes())]
+        for s in systems:
+            s.Update(use_metamodel=False)
+        # cost constraint and deadlines are violated by about half of systems
+        costs = sorted(s.cost for s in systems)
+        limits = [sorted(s.modules[num].time for s in systems)[len(systems) / 2] for num in range(Module.conf.modNum)]
+        System.constraints = [TimeConstraints(limits), CostConstraints(costs[len(costs) / 2])]
+        for s in systems:
+            s.ComputePenalty()
+        pop = Population(systems)
+        pop.computeRel()
+        pop.computeCost()
+        pop.readTimes()
+        pop.computePenalty(System.constraints)
+        for i, s in enumerate(systems):
+            self.assertEqual((pop.relL[i], pop.relR[i]), (s.relL, s.relR))
+            self.assertEqual(pop.cost[i], s.cost)
+            self.assertEqual(pop.times[i].tolist(), [m.time for m in s.modules])
+            self.assertEqual(pop.penalty[i], s.penalty)
+        self.assertTrue(0 < sum(pop.penalty < 1) < len(systems))
+        self.assertTrue(any(not System.constraints[0].CheckConstraints(s) for s in systems))
+
+    def test_encode(self):
+        for i in range(50):
+            s = randomSystem(self.rnd)
+            self.assertEqual(decodeModules(encode(s)), s.modules)
+
+if __name__ == "__main__":
+    unittest.main()
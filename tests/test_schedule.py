@@ -0,0 +1,57 @@
+'''Simulation cache is keyed by schedule fingerprint, so schedules with equal fingerprints
+must have equal simulated times. Run from the root of repository:
+python -m unittest discover tests
+'''
+import os, sys, random, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Common.System import System
+from Common.Module import Module, tools
+from Common.Algorithm import Algorithm
+from Common import Timecounter
+from GA.GAConfig import GAConfig
+from test_exact import systemXML, load
+
+def randomSystem(rnd):
+    s = System()
+    for conf in Module.conf.modules:
+        tool = rnd.choice(conf.tools)
+        hw, sw = rnd.choice(conf.GetConfigs(tool))
+        s.modules.append(tools[tool](conf.num, hw, sw))
+    return s
+
+class ScheduleTest(unittest.TestCase):
+    def setUp(self):
+        self.saved = (getattr(Module, "conf", None), Algorithm.algconf, System.constraints)
+        Algorithm.algconf = GAConfig()
+
+    def tearDown(self):
+        Module.conf, Algorithm.algconf, System.constraints = self.saved
+
+    def test_fingerprint_defines_times(self):
+        reordered = 0
+        for seed in range(3):
+            rnd = random.Random(seed)
+            load(systemXML(6, rnd))
+            for i in range(30):
+                sch = randomSystem(rnd).toSchedule()
+                times = Timecounter.simulate(sch)
+                key = sch.fingerprint()
+                # tasks and links order defines order on processors and on the channel
+                rnd.shuffle(sch.tasks if rnd.random() < 0.5 else sch.links)
+                other = Timecounter.simulate(sch)
+                if sch.fingerprint() == key:
+                    self.assertEqual(other, times)
+                elif other != times:
+                    reordered += 1
+        self.assertTrue(reordered > 0)
+
+    def test_configuration_fingerprint(self):
+        # archive of simulated times is keyed by configuration, links order is order in schedule
+        load(systemXML(6, random.Random(0)))
+        key = Module.conf.fingerprint()
+        Module.conf.links.reverse()
+        Module.conf.hash = None
+        self.assertNotEqual(Module.conf.fingerprint(), key)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+'''Sort keys of GA (GA.sort_key_*, GA_Moore.sort_key_moore) must give the same orderings
+as comparison functions they replace. Run from the root of repository:
+python -m unittest discover tests
+'''
+import os, sys, random, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from GA import GA, GA_Moore
+
+class Individual:
+    '''Part of System which is used by comparisons and keys.'''
+    def __init__(self, relL, relR, penalty):
+        self.relL = relL
+        self.relR = relR
+        self.penalty = penalty
+        self.keys = {}
+
+    def __repr__(self):
+        return "(%s, %s, %s)" % (self.relL, self.relR, self.penalty)
+
+def population(size, rnd):
+    '''Random population with a lot of equal and nested intervals and penalties.'''
+    bounds = [0.5, 0.6, 0.7, 0.75, 0.8, 0.9, 0.95, 1.0]
+    penalties = [1.0, 1.0, 1.0, 0.9, 0.5]
+    pop = []
+    for i in range(size):
+        if pop != [] and rnd.random() < 0.2:
+            x = rnd.choice(pop)
+            pop.append(Individual(x.relL, x.relR, x.penalty))
+            continue
+        l, r = sorted([rnd.choice(bounds), rnd.choice(bounds)])
+        pop.append(Individual(l, r, rnd.choice(penalties)))
+    return pop
+
+class SortKeysTest(unittest.TestCase):
+    def setUp(self):
+        self.rnd = random.Random(1)
+        self.currSolution = GA_Moore.g_currSolution
+
+    def tearDown(self):
+        GA_Moore.g_currSolution = self.currSolution
+
+    def check(self, cmp, key, times=200):
+        for i in range(times):
+            pop = population(self.rnd.randint(2, 40), self.rnd)
+            expected = sorted(pop, cmp=cmp)
+            self.assertEqual([id(x) for x in sorted(pop, key=key)], [id(x) for x in expected], pop)
+            #keys are cached, second sort must use them
+            self.assertEqual([id(x) for x in sorted(pop, key=key)], [id(x) for x in expected], pop)
+
+    def test_pessimistic_extended(self):
+        self.check(GA.interval_cmp_pessimistic_extended, GA.sort_key_pessimistic_extended)
+
+    def test_moore_without_solution(self):
+        GA_Moore.g_currSolution = None
+        self.check(GA_Moore.interval_cmp_moore, GA_Moore.sort_key_moore)
+
+    def test_moore_with_solution(self):
+        for i in range(20):
+            GA_Moore.g_currSolution = population(1, self.rnd)[0]
+            self.check(GA_Moore.interval_cmp_moore, GA_Moore.sort_key_moore, 20)
+
+    def test_moore_solution_change(self):
+        pop = population(30, self.rnd)
+        for i in range(10):
+            GA_Moore.g_currSolution = population(1, self.rnd)[0]
+            expected = sorted(pop, cmp=GA_Moore.interval_cmp_moore)
+            self.assertEqual([id(x) for x in sorted(pop, key=GA_Moore.sort_key_moore)], [id(x) for x in expected])
+
+if __name__ == "__main__":
+    unittest.main()
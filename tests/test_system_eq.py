@@ -0,0 +1,66 @@
+'''Systems are equal when their chromosomes (tool, hw and sw versions of every module) are equal:
+System.__eq__ must agree with System.__hash__ used by fitness cache, and distance counts tool changes.
+Run from the root of repository:
+python -m unittest discover tests
+'''
+import os, sys, random, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Common.SysConfig import SysConfig
+from Common.System import System
+from Common.Module import Module, tools
+from Common.Algorithm import Algorithm
+from GA.GAConfig import GAConfig
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "example.xml")
+
+def randomSystem(rnd):
+    s = System()
+    for num in range(Module.conf.modNum):
+        tool = rnd.choice(Module.conf.modules[num].tools)
+        hw, sw = rnd.choice(Module.conf.modules[num].GetConfigs(tool))
+        s.modules.append(tools[tool](num, hw, sw))
+    return s
+
+class SystemEqTest(unittest.TestCase):
+    def setUp(self):
+        self.saved = (getattr(Module, "conf", None), Algorithm.algconf)
+        Algorithm.algconf = GAConfig()
+        Module.conf = SysConfig()
+        Module.conf.loadXML(EXAMPLE)
+
+    def tearDown(self):
+        Module.conf, Algorithm.algconf = self.saved
+
+    def test_same_versions_other_tool(self):
+        # modules without fault tolerance and HWRC20 modules have one hw and one sw version
+        s1 = System()
+        s2 = System()
+        for num in range(Module.conf.modNum):
+            hw, sw = Module.conf.modules[num].GetConfigs("none")[0]
+            s1.modules.append(tools["none"](num, hw, sw))
+            s2.modules.append(tools["none"](num, hw, sw))
+        self.assertTrue(s1 == s2)
+        self.assertEqual(s1.distance(s2), 0)
+        changed = 0
+        for num in range(Module.conf.modNum):
+            if "hwrc20" in Module.conf.modules[num].tools:
+                m = s1.modules[num]
+                s2.modules[num] = tools["hwrc20"](num, list(m.hw), list(m.sw))
+                changed += 1
+        self.assertTrue(changed > 0)
+        self.assertFalse(s1 == s2)
+        self.assertNotEqual(hash(s1), hash(s2))
+        self.assertEqual(s1.distance(s2), changed)
+
+    def test_eq_agrees_with_hash(self):
+        rnd = random.Random(0)
+        systems = [randomSystem(rnd) for i in range(300)]
+        for s1, s2 in zip(systems, systems[1:] + systems[:1]):
+            same = s1.chromosome() == s2.chromosome()
+            self.assertEqual(s1 == s2, same)
+            self.assertEqual(s1.distance(s2) == 0, same)
+            self.assertTrue(s1 == s1.copy())
+            self.assertEqual(hash(s1), hash(s1.copy()))
+
+if __name__ == "__main__":
+    unittest.main()